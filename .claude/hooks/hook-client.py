@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Thin hook entry point: forwards to hook-daemon.py, runs in-process if it is down.
+
+Usage (as registered by merge-settings.py --daemon):
+    python3 ~/.claude/hooks/hook-client.py validators/validate-orchestrate-files.py
+
+Set CLAUDE_HOOK_DAEMON=off to skip the daemon and its auto-start entirely.
+If the daemon is down, cannot take the request, or asks for a restart
+because hook files changed, the hook runs in this process instead. Once
+the request is sent the hook is never run a second time: a daemon that
+dies before answering is reported as a hook failure (blocking for
+validators), and a slow one is bounded by the hook's own timeout.
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parent
+SOCKET_PATH = Path.home() / ".cache" / "claude-code" / "hook-daemon.sock"
+
+
+def connect():
+    """Connect to the daemon socket, or return None if nobody is listening"""
+    if os.environ.get("CLAUDE_HOOK_DAEMON") == "off":
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(SOCKET_PATH))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def start_daemon():
+    """Launch the daemon in the background so the next hook call is warm"""
+    import subprocess  # only needed on this path; keeps the warm path's imports small
+
+    try:
+        subprocess.Popen(
+            [sys.executable, str(HOOKS_DIR / "hook-daemon.py"), "start"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def runtime():
+    """hook_runtime, imported only off the warm path"""
+    sys.path.insert(0, str(HOOKS_DIR))
+    import hook_runtime
+
+    return hook_runtime
+
+
+def run_local(script, args, stdin_data):
+    """Fallback: execute the hook in this interpreter"""
+    hook_runtime = runtime()
+    try:
+        path = hook_runtime.resolve_script(script)
+    except (OSError, ValueError) as e:
+        print(f"hook-client: {e}", file=sys.stderr)
+        return hook_runtime.failure_status(script)
+    status, out, err = hook_runtime.run_hook(path, args, stdin_data)
+    sys.stdout.write(out)
+    sys.stderr.write(err)
+    return status
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: hook-client.py <script relative to ~/.claude> [args...]", file=sys.stderr)
+        return 1
+    script, args = sys.argv[1], sys.argv[2:]
+    stdin_data = sys.stdin.buffer.read()
+
+    sock = connect()
+    if sock is None:
+        if os.environ.get("CLAUDE_HOOK_DAEMON") != "off":
+            start_daemon()
+        return run_local(script, args, stdin_data)
+
+    header = {"script": script, "argv": args, "cwd": os.getcwd(), "env": dict(os.environ)}
+    try:
+        sock.sendall(json.dumps(header).encode("utf-8") + b"\n" + stdin_data)
+        sock.shutdown(socket.SHUT_WR)
+    except OSError:
+        sock.close()
+        start_daemon()
+        return run_local(script, args, stdin_data)
+
+    chunks = []
+    try:
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        response = json.loads(b"".join(chunks).decode("utf-8"))
+    except (OSError, ValueError):
+        response = None
+    finally:
+        sock.close()
+
+    if not isinstance(response, dict):
+        # The daemon may already have run the hook: report it, never run it twice
+        print("hook-client: hook daemon closed the connection without answering", file=sys.stderr)
+        return runtime().failure_status(script)
+    if response.get("restart"):
+        # Serving stale code, so it did not run the hook
+        start_daemon()
+        return run_local(script, args, stdin_data)
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return response.get("exit", 1)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
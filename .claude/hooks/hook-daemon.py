@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Long-lived hook server: keeps validator and stats collector warm on a Unix socket.
+
+Usage:
+    hook-daemon.py start     # start in background (no-op if already running)
+    hook-daemon.py serve     # run in foreground
+    hook-daemon.py stop
+    hook-daemon.py status
+
+Requests come from hook-client.py, one per connection: a JSON header line
+    {"script": "validators/...py", "argv": [], "cwd": "...", "env": {...}}
+followed by the raw hook stdin until EOF. They are answered with:
+    {"exit": 0, "stdout": "...", "stderr": "..."}
+or, when any file in ~/.claude/hooks or ~/.claude/validators changed since
+startup, with {"restart": true}: the daemon gives up its socket and exits,
+and the client runs the hook itself and starts a fresh daemon.
+
+Each request runs in a child forked from the warm daemon, so parallel
+batch tasks do not queue behind one slow hook and a crashing hook cannot
+take the daemon down with it.
+
+The daemon also exits after IDLE_TIMEOUT seconds without a request, or
+once ~/.claude is gone (e.g. a deleted temporary HOME).
+"""
+
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import hook_runtime  # noqa: E402
+
+IDLE_TIMEOUT = int(os.environ.get("CLAUDE_HOOK_DAEMON_IDLE", 15 * 60))
+
+# Scripts compiled at startup so the first request is already warm
+PRELOAD_SCRIPTS = (
+    "validators/validate-orchestrate-files.py",
+    "hooks/stats-collector.py",
+)
+# Helper modules imported once here, so forked children start with them loaded
+PRELOAD_MODULES = ("verdict_cache", "secrets_scan")
+
+
+class HookHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            header = self.rfile.readline()
+            stdin_data = self.rfile.read()
+            if self.server.done:
+                # Retired by the parent on this request: hook files changed
+                self.wfile.write(json.dumps({"restart": True}).encode("utf-8"))
+                return
+        except OSError:
+            return  # client went away (e.g. an is_running() probe)
+        script = None
+        try:
+            request = json.loads(header.decode("utf-8"))
+            script = request["script"]
+            path = hook_runtime.resolve_script(script)
+            status, out, err = hook_runtime.run_hook(
+                path,
+                request.get("argv", []),
+                stdin_data,
+                env=request.get("env"),
+                cwd=request.get("cwd"),
+            )
+        except Exception as e:
+            status = hook_runtime.failure_status(script)
+            out, err = "", f"hook-daemon: {e}\n"
+        response = {"exit": status, "stdout": out, "stderr": err}
+        try:
+            self.wfile.write(json.dumps(response).encode("utf-8"))
+        except OSError:
+            pass
+
+
+class HookServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    # One child per request: run_script swaps process-wide state, which is
+    # only safe with one hook per process
+    timeout = IDLE_TIMEOUT
+
+    def server_activate(self):
+        super().server_activate()
+        self.done = False
+        self.released = False
+        self.socket_inode = os.stat(self.server_address).st_ino
+        self.fingerprint = hook_runtime.source_fingerprint()
+
+    def stale(self):
+        return hook_runtime.source_fingerprint() != self.fingerprint
+
+    def process_request(self, request, client_address):
+        # Checked in the parent, before forking: a child cannot retire the server
+        if not self.done and self.stale():
+            self.retire()
+        super().process_request(request, client_address)
+
+    def retire(self):
+        """Stop accepting work and free the socket path for a successor"""
+        self.done = True
+        self.release_paths()
+
+    def release_paths(self):
+        """Remove socket and PID file, unless a newer daemon already owns them"""
+        # Only once: after retire() a successor may reuse the socket's inode
+        if self.released:
+            return
+        self.released = True
+        try:
+            if os.stat(self.server_address).st_ino == self.socket_inode:
+                os.unlink(self.server_address)
+        except FileNotFoundError:
+            pass
+        try:
+            if hook_runtime.PID_FILE.read_text().strip() == str(os.getpid()):
+                hook_runtime.PID_FILE.unlink()
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def handle_timeout(self):
+        super().handle_timeout()
+        self.done = True
+
+
+def is_running():
+    """True if something is accepting connections on the daemon socket"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(hook_runtime.SOCKET_PATH))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def serve():
+    if is_running():
+        print("SKIP: hook daemon already running")
+        return 0
+
+    hook_runtime.CACHE_DIR.mkdir(parents=True, exist_ok=True, mode=0o700)
+    try:
+        hook_runtime.SOCKET_PATH.unlink()
+    except FileNotFoundError:
+        pass
+
+    for name in PRELOAD_SCRIPTS:
+        try:
+            hook_runtime.load_code(hook_runtime.resolve_script(name))
+        except (OSError, ValueError, SyntaxError):
+            pass
+    for d in hook_runtime.ALLOWED_DIRS:
+        sys.path.append(str(hook_runtime.CLAUDE_DIR / d))
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+    old_umask = os.umask(0o077)
+    try:
+        server = HookServer(str(hook_runtime.SOCKET_PATH), HookHandler)
+    finally:
+        os.umask(old_umask)
+
+    hook_runtime.PID_FILE.write_text(str(os.getpid()))
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while not server.done and hook_runtime.CLAUDE_DIR.is_dir():
+            server.handle_request()
+            server.collect_children()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.release_paths()
+    return 0
+
+
+def start():
+    """Spawn a detached `serve` process"""
+    if is_running():
+        print("SKIP: hook daemon already running")
+        return 0
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "serve"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    print(f"OK: hook daemon starting on {hook_runtime.SOCKET_PATH}")
+    return 0
+
+
+def stop():
+    try:
+        pid = int(hook_runtime.PID_FILE.read_text().strip())
+    except (OSError, ValueError):
+        print("SKIP: hook daemon not running")
+        return 0
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        hook_runtime.PID_FILE.unlink(missing_ok=True)
+        print("SKIP: hook daemon not running")
+        return 0
+    print(f"OK: stopped hook daemon (pid {pid})")
+    return 0
+
+
+def status():
+    if is_running():
+        print(f"running on {hook_runtime.SOCKET_PATH}")
+        return 0
+    print("not running")
+    return 1
+
+
+def main():
+    commands = {"serve": serve, "start": start, "stop": stop, "status": status}
+    if len(sys.argv) != 2 or sys.argv[1] not in commands:
+        print(f"Usage: {Path(sys.argv[0]).name} {{{'|'.join(commands)}}}", file=sys.stderr)
+        return 1
+    return commands[sys.argv[1]]()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""In-process runner for hook scripts, shared by hook-daemon.py and hook-client.py"""
+
+import builtins
+import io
+import os
+import sys
+import traceback
+from pathlib import Path
+
+CLAUDE_DIR = Path.home() / ".claude"
+CACHE_DIR = Path.home() / ".cache" / "claude-code"
+SOCKET_PATH = CACHE_DIR / "hook-daemon.sock"
+PID_FILE = CACHE_DIR / "hook-daemon.pid"
+
+# Only scripts installed into these ~/.claude subdirectories may be run
+ALLOWED_DIRS = ("validators", "hooks")
+
+# Compiled code per script path: {path: (mtime_ns, size, code)}
+_code_cache = {}
+
+
+def resolve_script(name):
+    """Resolve a script name relative to ~/.claude, rejecting anything outside ALLOWED_DIRS"""
+    path = (CLAUDE_DIR / name).resolve()
+    allowed = [(CLAUDE_DIR / d).resolve() for d in ALLOWED_DIRS]
+    if path.suffix != ".py" or path.parent not in allowed:
+        raise ValueError(f"script not allowed: {name}")
+    if not path.is_file():
+        raise FileNotFoundError(f"script not found: {path}")
+    return path
+
+
+def failure_status(script):
+    """Exit status for a hook that could not be run, or whose result was lost.
+
+    Validators run as PreToolUse hooks, where only exit 2 blocks: they fail
+    closed so a Write is never let through unchecked. Other hooks report a
+    non-blocking error. An unknown script (None) fails closed too.
+    """
+    if script is None:
+        return 2
+    return 2 if Path(str(script)).parent.name == "validators" else 1
+
+
+def source_fingerprint():
+    """(name, mtime_ns, size) of every script and helper module in ALLOWED_DIRS.
+
+    Helper modules imported by hook scripts (verdict_cache, secrets_scan, ...)
+    stay in sys.modules for the daemon's lifetime, so a changed fingerprint
+    means the daemon is serving stale code and must restart.
+    """
+    entries = []
+    for d in ALLOWED_DIRS:
+        try:
+            with os.scandir(CLAUDE_DIR / d) as it:
+                for entry in it:
+                    if entry.name.endswith(".py"):
+                        st = entry.stat()
+                        entries.append((f"{d}/{entry.name}", st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+    return tuple(sorted(entries))
+
+
+def load_code(path):
+    """Compile a script once and reuse the code object until the file changes"""
+    st = os.stat(path)
+    cached = _code_cache.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    with open(path, encoding="utf-8") as f:
+        code = compile(f.read(), str(path), "exec")
+    _code_cache[path] = (st.st_mtime_ns, st.st_size, code)
+    return code
+
+
+def _exit_code(code, stderr):
+    """Translate a SystemExit payload into a process exit status"""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=stderr)
+    return 1
+
+
+def _text_stream(buffer):
+    # Like the real std streams: text on top of a binary .buffer
+    return io.TextIOWrapper(buffer, encoding="utf-8", errors="surrogateescape", write_through=True)
+
+
+def run_script(path, argv, stdin_data, env=None, cwd=None):
+    """Execute a hook script as __main__ with captured stdio.
+
+    stdin_data is the raw hook input (bytes). Returns (exit_code, stdout,
+    stderr). Process-wide state (argv, stdio, environment, cwd) is swapped
+    for the duration of the call, so callers must not run scripts
+    concurrently in one process.
+    """
+    code = load_code(path)
+    out_buf, err_buf = io.BytesIO(), io.BytesIO()
+    out, err = _text_stream(out_buf), _text_stream(err_buf)
+    saved = (sys.argv, sys.stdin, sys.stdout, sys.stderr, list(sys.path))
+    saved_env = dict(os.environ) if env is not None else None
+    saved_cwd = os.getcwd() if cwd is not None else None
+
+    sys.argv = [str(path), *argv]
+    sys.stdin = _text_stream(io.BytesIO(stdin_data))
+    sys.stdout, sys.stderr = out, err
+    sys.path.insert(0, str(path.parent))
+    if env is not None:
+        os.environ.clear()
+        os.environ.update(env)
+    try:
+        if cwd is not None:
+            os.chdir(cwd)
+        exec(code, {"__name__": "__main__", "__file__": str(path), "__builtins__": builtins})
+        status = 0
+    except SystemExit as e:
+        status = _exit_code(e.code, err)
+    except Exception:
+        traceback.print_exc(file=err)
+        status = 1
+    finally:
+        sys.argv, sys.stdin, sys.stdout, sys.stderr, sys.path[:] = saved
+        if saved_env is not None:
+            os.environ.clear()
+            os.environ.update(saved_env)
+        if saved_cwd is not None:
+            os.chdir(saved_cwd)
+
+    return (status, out_buf.getvalue().decode("utf-8", "replace"),
+            err_buf.getvalue().decode("utf-8", "replace"))
+
+
+def run_hook(path, argv, stdin_data, env=None, cwd=None):
+    """Run a hook script, answering validator calls from the verdict cache when possible"""
+    if path.name == "validate-orchestrate-files.py":
+        import verdict_cache
+
+        if verdict_cache.enabled(env):
+            return verdict_cache.cached_run(run_script, path, argv, stdin_data, env=env, cwd=cwd)
+    return run_script(path, argv, stdin_data, env=env, cwd=cwd)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Indexed session and task state for session-start.py / session-end.py.
+
+One SQLite database (WAL mode) replaces walking per-session files and every
+tmp/.orchestrate/*/task.md at startup:
+
+    sessions(session_id, project_dir, slug, phase, ended_at, data)
+    tasks(project_dir, slug, status, mtime_ns, updated_at)
+
+SessionEnd calls save_session() and sync_tasks(), which re-reads only the
+task.md files whose mtime changed. SessionStart calls startup_context(),
+which syncs the current project first (one scandir plus one stat per
+task, so tasks added by git pull, a crashed session or a manual edit
+still show up) and then does a pair of indexed reads keyed by project dir.
+
+Usage:
+    session_store.py show [PROJECT_DIR]
+    session_store.py migrate            # import ~/.cache/claude-code/sessions/*.json
+    session_store.py prune [DAYS]       # drop sessions / completed tasks older than DAYS (default 30)
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+CACHE_DIR = Path.home() / ".cache" / "claude-code"
+DB_PATH = CACHE_DIR / "state.db"
+LEGACY_SESSIONS_DIR = CACHE_DIR / "sessions"
+TTL_DAYS = 30
+DONE_STATUSES = ("complete",)
+STATUS_RE = re.compile(r"^[\s>*_-]*Status[*_\s]*:[*_\s]*([A-Za-z-]+)", re.MULTILINE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    project_dir TEXT NOT NULL,
+    slug TEXT,
+    phase TEXT,
+    ended_at REAL NOT NULL,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_by_project ON sessions(project_dir, ended_at);
+CREATE TABLE IF NOT EXISTS tasks (
+    project_dir TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    status TEXT,
+    mtime_ns INTEGER,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (project_dir, slug)
+);
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks(project_dir, status);
+"""
+
+
+def resolve_project_dir(argv=None):
+    """Same fallback chain as the session hooks"""
+    argv = sys.argv if argv is None else argv
+    if len(argv) > 1 and argv[1]:
+        return os.path.abspath(argv[1])
+    for var in ("CLAUDE_PROJECT_DIR", "PROJECT_DIR", "INIT_CWD"):
+        if os.environ.get(var):
+            return os.path.abspath(os.environ[var])
+    return os.getcwd()
+
+
+def read_status(task_md):
+    """Status header of a task.md (only the first 4 KB is read)"""
+    try:
+        with open(task_md, encoding="utf-8", errors="replace") as f:
+            head = f.read(4096)
+    except OSError:
+        return None
+    m = STATUS_RE.search(head)
+    return m.group(1).lower() if m else None
+
+
+class SessionStore:
+    def __init__(self, path=DB_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self.db = sqlite3.connect(str(path), timeout=5.0, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def save_session(self, session_id, project_dir, slug=None, phase=None, data=None, ended_at=None):
+        self.db.execute(
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+            (session_id, project_dir, slug, phase,
+             time.time() if ended_at is None else ended_at,
+             json.dumps(data) if data is not None else None),
+        )
+
+    def sync_tasks(self, project_dir):
+        """Refresh task rows from tmp/.orchestrate/*/task.md, parsing only changed files"""
+        root = Path(project_dir) / "tmp" / ".orchestrate"
+        known = {
+            row["slug"]: row["mtime_ns"]
+            for row in self.db.execute(
+                "SELECT slug, mtime_ns FROM tasks WHERE project_dir = ?", (project_dir,)
+            )
+        }
+        seen = set()
+        try:
+            entries = list(os.scandir(root))
+        except OSError:
+            entries = []
+        now = time.time()
+        self.db.execute("BEGIN")
+        try:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                task_md = os.path.join(entry.path, "task.md")
+                try:
+                    mtime_ns = os.stat(task_md).st_mtime_ns
+                except OSError:
+                    continue
+                seen.add(entry.name)
+                if known.get(entry.name) == mtime_ns:
+                    continue
+                self.db.execute(
+                    "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?)",
+                    (project_dir, entry.name, read_status(task_md), mtime_ns, now),
+                )
+            for slug in known.keys() - seen:
+                self.db.execute(
+                    "DELETE FROM tasks WHERE project_dir = ? AND slug = ?", (project_dir, slug)
+                )
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+
+    def last_session(self, project_dir):
+        row = self.db.execute(
+            "SELECT * FROM sessions WHERE project_dir = ? ORDER BY ended_at DESC LIMIT 1",
+            (project_dir,),
+        ).fetchone()
+        if row is None:
+            return None
+        session = dict(row)
+        session["data"] = json.loads(session["data"]) if session["data"] else None
+        return session
+
+    def active_tasks(self, project_dir):
+        placeholders = ",".join("?" * len(DONE_STATUSES))
+        rows = self.db.execute(
+            f"SELECT slug, status FROM tasks WHERE project_dir = ? "
+            f"AND (status IS NULL OR status NOT IN ({placeholders})) ORDER BY updated_at DESC",
+            (project_dir, *DONE_STATUSES),
+        )
+        return [dict(row) for row in rows]
+
+    def startup_context(self, project_dir, sync=True):
+        """Everything SessionStart shows: last session and active tasks"""
+        if sync:
+            self.sync_tasks(project_dir)
+        return {
+            "last_session": self.last_session(project_dir),
+            "active_tasks": self.active_tasks(project_dir),
+        }
+
+    def prune(self, ttl_days=TTL_DAYS):
+        """Drop sessions and completed tasks older than ttl_days. Returns rows removed."""
+        cutoff = time.time() - ttl_days * 86400
+        placeholders = ",".join("?" * len(DONE_STATUSES))
+        removed = self.db.execute("DELETE FROM sessions WHERE ended_at < ?", (cutoff,)).rowcount
+        removed += self.db.execute(
+            f"DELETE FROM tasks WHERE updated_at < ? AND status IN ({placeholders})",
+            (cutoff, *DONE_STATUSES),
+        ).rowcount
+        return removed
+
+    def migrate_legacy(self, sessions_dir=LEGACY_SESSIONS_DIR):
+        """Import per-session JSON files written by older session-end.py.
+
+        Files are left in place; re-running is harmless. Returns the number imported.
+        """
+        imported = 0
+        for path in sorted(sessions_dir.glob("*.json")):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if not isinstance(data, dict):
+                continue
+            project_dir = data.get("project_dir") or data.get("cwd")
+            if not project_dir:
+                continue
+            ended_at = data.get("ended_at") or data.get("timestamp")
+            if not isinstance(ended_at, (int, float)):
+                ended_at = path.stat().st_mtime
+            cur = self.db.execute(
+                "INSERT OR IGNORE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                (data.get("session_id") or path.stem, project_dir,
+                 data.get("slug") or data.get("task_slug"), data.get("phase"),
+                 ended_at, json.dumps(data)),
+            )
+            imported += cur.rowcount
+        return imported
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ("show", "migrate", "prune"):
+        print(__doc__[__doc__.index("Usage:"):], file=sys.stderr)
+        return 1
+    store = SessionStore()
+    try:
+        if args[0] == "show":
+            project_dir = resolve_project_dir(args)
+            print(json.dumps(store.startup_context(project_dir), indent=2))
+        elif args[0] == "migrate":
+            print(f"OK: imported {store.migrate_legacy()} sessions")
+        else:
+            days = float(args[1]) if len(args) > 1 else TTL_DAYS
+            print(f"OK: pruned {store.prune(days)} rows")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
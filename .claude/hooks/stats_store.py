@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""Write-volume storage for stats-collector.py: append-only log + rollup index.
+
+Each orchestrate Write becomes one tab-separated line in stats.log:
+    ts  slug  phase  agent  bytes  session
+Appends hold a shared flock, so parallel batch tasks write concurrently
+(O_APPEND keeps lines whole); fsync runs once per SYNC_BYTES of log growth
+rather than per record. When the log passes COMPACT_BYTES, whoever gets the
+exclusive lock first renames it to a numbered segment (stats.log.N), folds
+that into rollup.json, keyed slug -> phase -> agent with "*" aggregates at
+each level, and deletes the segment. rollup.json records the last folded
+segment, so a compaction interrupted by a crash neither loses records nor
+counts them twice. Queries read the index plus the short log tail, so they
+never rescan history.
+
+Usage:
+    stats_store.py phases SLUG        # writes per phase
+    stats_store.py agents SLUG PHASE  # writes per agent in a phase
+    stats_store.py batches SLUG       # wall-clock time per execution batch/wave
+    stats_store.py tasks              # totals per task slug
+    stats_store.py compact
+Add --json for machine-readable output.
+"""
+
+import fcntl
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+STATS_DIR = Path.home() / ".cache" / "claude-code" / "stats"
+SYNC_BYTES = 16 * 1024
+COMPACT_BYTES = 256 * 1024
+ALL = "*"
+PHASE_DIRS = ("research", "plan", "execution")
+ORCHESTRATE_RE = re.compile(r"tmp/\.orchestrate/([^/]+)/(.+)$")
+# Older tasks reviewed per batch, scheduled ones per wave
+REVIEW_RE = re.compile(r"^(batch|wave)-(\d+)-review$")
+
+# rollup.json: {"folded": N, "rollup": {...}}, N = last segment folded in
+# Rollup cell: [count, bytes, first_ts, last_ts]
+
+
+def classify(file_path):
+    """(slug, phase, agent) for an orchestrate file path, or None"""
+    m = ORCHESTRATE_RE.search(file_path.replace(os.sep, "/"))
+    if not m:
+        return None
+    slug, rest = m.groups()
+    parts = rest.split("/")
+    stem = Path(parts[-1]).stem
+    if len(parts) > 1 and parts[0] in PHASE_DIRS:
+        return slug, parts[0], stem
+    # Top-level files: task.md belongs to the task itself, architecture.md is its own phase
+    return slug, "architecture" if stem == "architecture" else "task", stem
+
+
+def _clean(value):
+    return str(value).replace("\t", " ").replace("\n", " ")
+
+
+def _fold(rollup, slug, phase, agent, size, ts):
+    for p, a in ((phase, agent), (phase, ALL), (ALL, ALL)):
+        cell = rollup.setdefault(slug, {}).setdefault(p, {}).get(a)
+        if cell is None:
+            rollup[slug][p][a] = [1, size, ts, ts]
+        else:
+            cell[0] += 1
+            cell[1] += size
+            cell[2] = min(cell[2], ts)
+            cell[3] = max(cell[3], ts)
+
+
+def _fold_log(rollup, data):
+    for line in data.splitlines():
+        fields = line.split("\t")
+        if len(fields) < 5:
+            continue  # torn line from a crash mid-write
+        try:
+            ts, size = float(fields[0]), int(fields[4])
+        except ValueError:
+            continue
+        _fold(rollup, fields[1], fields[2], fields[3], size, ts)
+
+
+class StatsStore:
+    def __init__(self, stats_dir=STATS_DIR):
+        self.dir = stats_dir
+        self.log_path = stats_dir / "stats.log"
+        self.index_path = stats_dir / "rollup.json"
+        self.lock_path = stats_dir / "stats.lock"
+        self.buffer = []
+
+    def _lock(self, mode):
+        self.dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, mode)
+        except OSError:
+            os.close(fd)
+            raise
+        return fd
+
+    def append(self, slug, phase, agent, size, session="", ts=None):
+        """Buffer one record; written by the next flush()"""
+        ts = time.time() if ts is None else ts
+        fields = (f"{ts:.3f}", slug, phase, agent, str(size), session)
+        self.buffer.append("\t".join(_clean(f) for f in fields) + "\n")
+
+    def flush(self):
+        """Write buffered records in one append, fsyncing at SYNC_BYTES boundaries"""
+        if not self.buffer:
+            return
+        data = "".join(self.buffer).encode("utf-8")
+        self.buffer = []
+        lock = self._lock(fcntl.LOCK_SH)
+        try:
+            fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, data)
+                size = os.fstat(fd).st_size
+                if size // SYNC_BYTES != (size - len(data)) // SYNC_BYTES:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+        finally:
+            os.close(lock)
+        if size > COMPACT_BYTES:
+            self.compact(blocking=False)
+
+    def _load_index(self):
+        """(rollup, number of the last segment folded into it)"""
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return {}, 0
+        if "folded" not in index:
+            return index, 0  # written before segments existed
+        return index["rollup"], index["folded"]
+
+    def _segments(self):
+        """Sorted (number, path) of logs renamed away for compaction"""
+        segments = []
+        for path in self.dir.glob(self.log_path.name + ".*"):
+            suffix = path.name[len(self.log_path.name) + 1:]
+            if suffix.isdigit():
+                segments.append((int(suffix), path))
+        return sorted(segments)
+
+    def _read_log(self, path=None):
+        try:
+            with open(path or self.log_path, encoding="utf-8", errors="replace") as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
+
+    def compact(self, blocking=True):
+        """Fold the log into the rollup index and delete it.
+
+        The log is renamed to segment N first and the index records N when
+        it is replaced, so after a crash at any step the next compaction
+        folds unfolded segments and only deletes already folded ones.
+        Returns False if another process holds the lock and blocking is False.
+        """
+        mode = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            lock = self._lock(mode)
+        except BlockingIOError:
+            return False
+        try:
+            rollup, folded = self._load_index()
+            pending = []
+            for n, path in self._segments():
+                if n <= folded:
+                    path.unlink()  # folded before a crash, not yet deleted
+                else:
+                    pending.append((n, path))
+            try:
+                if os.path.getsize(self.log_path):
+                    n = max([folded] + [n for n, _ in pending]) + 1
+                    segment = self.log_path.with_name(f"{self.log_path.name}.{n}")
+                    # Appenders hold the shared lock, so none has the log open
+                    os.rename(self.log_path, segment)
+                    pending.append((n, segment))
+            except FileNotFoundError:
+                pass
+            if not pending:
+                return True
+            for _, path in pending:
+                _fold_log(rollup, self._read_log(path))
+            index = {"folded": pending[-1][0], "rollup": rollup}
+            fd, tmp_path = tempfile.mkstemp(dir=self.dir, suffix=".tmp", prefix=".rollup-")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(index, f, separators=(",", ":"))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.index_path)
+            except Exception:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            for _, path in pending:
+                path.unlink()
+            return True
+        finally:
+            os.close(lock)
+
+    def rollup(self):
+        """Current rollup: compacted index plus records still in the log"""
+        lock = self._lock(fcntl.LOCK_SH)
+        try:
+            rollup, folded = self._load_index()
+            for n, path in self._segments():
+                if n > folded:
+                    _fold_log(rollup, self._read_log(path))
+            _fold_log(rollup, self._read_log())
+        finally:
+            os.close(lock)
+        return rollup
+
+
+def record_write(payload, store=None):
+    """Record a PostToolUse Write payload. Returns False for non-orchestrate files."""
+    tool_input = payload.get("tool_input") or {}
+    file_path = tool_input.get("file_path") or ""
+    info = classify(file_path)
+    if info is None:
+        return False
+    content = tool_input.get("content") or ""
+    store = store or StatsStore()
+    store.append(*info, len(content.encode("utf-8")), payload.get("session_id", ""))
+    store.flush()
+    return True
+
+
+def writes_per_phase(rollup, slug):
+    phases = rollup.get(slug, {})
+    return {phase: agents[ALL][0] for phase, agents in phases.items() if phase != ALL}
+
+
+def writes_per_agent(rollup, slug, phase):
+    agents = rollup.get(slug, {}).get(phase, {})
+    return {agent: cell[0] for agent, cell in agents.items() if agent != ALL}
+
+
+def time_per_batch(rollup, slug):
+    """Seconds per execution batch or wave, each ending at its batch-N-review
+    or wave-N-review write"""
+    execution = rollup.get(slug, {}).get("execution", {})
+    if ALL not in execution:
+        return {}
+    ends = sorted(
+        (cell[3], f"{m.group(1)}-{m.group(2)}")
+        for agent, cell in execution.items()
+        if (m := REVIEW_RE.match(agent))
+    )
+    result, start = {}, execution[ALL][2]
+    for end, name in ends:
+        result[name] = round(end - start, 3)
+        start = end
+    return result
+
+
+def task_totals(rollup):
+    return {
+        slug: {"writes": phases[ALL][ALL][0], "bytes": phases[ALL][ALL][1]}
+        for slug, phases in rollup.items()
+    }
+
+
+def _print(result, as_json):
+    if as_json:
+        print(json.dumps(result, indent=2))
+        return
+    for key, value in result.items():
+        print(f"{key:<32} {value}")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if a != "--json"]
+    as_json = len(args) != len(sys.argv) - 1
+    store = StatsStore()
+    if args == ["compact"]:
+        store.compact()
+        print("OK: compacted")
+        return 0
+    if args == ["tasks"]:
+        _print(task_totals(store.rollup()), as_json)
+        return 0
+    if len(args) == 2 and args[0] == "phases":
+        _print(writes_per_phase(store.rollup(), args[1]), as_json)
+        return 0
+    if len(args) == 3 and args[0] == "agents":
+        _print(writes_per_agent(store.rollup(), args[1], args[2]), as_json)
+        return 0
+    if len(args) == 2 and args[0] == "batches":
+        _print(time_per_batch(store.rollup(), args[1]), as_json)
+        return 0
+    print(__doc__[__doc__.index("Usage:"):], file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
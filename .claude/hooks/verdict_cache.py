@@ -0,0 +1,213 @@
+"""Persistent verdict cache for validate-orchestrate-files.py.
+
+Verdicts (exit code + output) are keyed by content hash, file type and
+validator version (hash of the installed validator source), stored in
+SQLite and evicted least-recently-used beyond MAX_ENTRIES.
+
+Append-only files (_progress.md, _issues.md) are validated incrementally:
+when a write extends the last accepted content of the same path, only the
+new tail (from the start of the last known line) is passed to the validator.
+These files carry no structure checks in orchestrate-file-formats.md, only
+the secrets scan, which is line-local.
+
+Cached output is stored with the file's path replaced by a placeholder, so
+a hit for the same content at another path reports the current path.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+VALIDATOR_NAME = "validate-orchestrate-files.py"
+CACHE_DB = Path.home() / ".cache" / "claude-code" / "validator-cache.db"
+MAX_ENTRIES = 4096
+ORCHESTRATE_MARKER = "tmp/.orchestrate/"
+APPEND_ONLY = {"_progress.md", "_issues.md"}
+
+# Only definitive verdicts are cached: 0 = accept, 2 = block
+CACHEABLE_STATUS = (0, 2)
+# Part of every key; bumped when the stored verdict format changes
+CACHE_FORMAT = 2
+PATH_TOKEN = "{{file_path}}"
+RELATIVE_PATH_TOKEN = "{{orchestrate_path}}"
+
+# Validator source hash per path: {path: (mtime_ns, size, digest)}
+_versions = {}
+
+
+def enabled(env=None):
+    return (env if env is not None else os.environ).get("CLAUDE_VALIDATOR_CACHE") != "off"
+
+
+def validator_version(path):
+    """Hash of the validator source, recomputed only when the file changes"""
+    st = os.stat(path)
+    cached = _versions.get(path)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    _versions[path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class VerdictCache:
+    """SQLite-backed LRU of validator verdicts plus last accepted content per path"""
+
+    def __init__(self, path=CACHE_DB, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self.db = sqlite3.connect(str(path), timeout=1.0, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            " key TEXT PRIMARY KEY, status INTEGER, stdout TEXT, stderr TEXT, last_used REAL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS paths ("
+            " path TEXT PRIMARY KEY, version TEXT, length INTEGER, digest TEXT, last_used REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS verdicts_lru ON verdicts(last_used)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS paths_lru ON paths(last_used)")
+
+    def get(self, key):
+        row = self.db.execute(
+            "SELECT status, stdout, stderr FROM verdicts WHERE key = ?", (key,)
+        ).fetchone()
+        if row:
+            self.db.execute("UPDATE verdicts SET last_used = ? WHERE key = ?", (time.time(), key))
+        return row
+
+    def put(self, key, verdict):
+        self.db.execute(
+            "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?)", (key, *verdict, time.time())
+        )
+        self._evict("verdicts")
+
+    def last_accepted(self, file_path, version):
+        """(length, digest) of the last accepted content at file_path, or None"""
+        row = self.db.execute(
+            "SELECT length, digest FROM paths WHERE path = ? AND version = ?", (file_path, version)
+        ).fetchone()
+        return row
+
+    def accept(self, file_path, version, content):
+        self.db.execute(
+            "INSERT OR REPLACE INTO paths VALUES (?, ?, ?, ?, ?)",
+            (file_path, version, len(content), _digest(content), time.time()),
+        )
+        self._evict("paths")
+
+    def _evict(self, table):
+        (count,) = self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+        if count > self.max_entries:
+            # Trim to 90% so eviction runs once per batch of inserts, not on every one
+            excess = count - self.max_entries * 9 // 10
+            self.db.execute(
+                f"DELETE FROM {table} WHERE rowid IN "
+                f"(SELECT rowid FROM {table} ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+
+    def close(self):
+        self.db.close()
+
+
+_cache = None
+
+
+def get_cache():
+    """Process-wide cache instance, so the daemon keeps one connection open"""
+    global _cache
+    if _cache is None:
+        _cache = VerdictCache()
+    return _cache
+
+
+def _path_forms(file_path):
+    """(placeholder, text) for the file's path as given and from tmp/.orchestrate/ on"""
+    return ((PATH_TOKEN, file_path),
+            (RELATIVE_PATH_TOKEN, file_path[file_path.index(ORCHESTRATE_MARKER):]))
+
+
+def strip_path(verdict, file_path):
+    """Verdict with file_path in its output replaced by placeholders, for storing"""
+    status, out, err = verdict
+    for token, form in _path_forms(file_path):
+        out, err = out.replace(form, token), err.replace(form, token)
+    return status, out, err
+
+
+def insert_path(verdict, file_path):
+    """Stored verdict with its placeholders filled in for file_path"""
+    status, out, err = verdict
+    for token, form in _path_forms(file_path):
+        out, err = out.replace(token, form), err.replace(token, form)
+    return status, out, err
+
+
+def incremental_tail(content, prev):
+    """New tail of an appended file, starting at the last line of the accepted prefix.
+
+    Returns None if content does not extend the previously accepted content.
+    """
+    if prev is None:
+        return None
+    length, digest = prev
+    if len(content) <= length or _digest(content[:length]) != digest:
+        return None
+    return content[content.rfind("\n", 0, length) + 1:]
+
+
+def cached_run(run, path, argv, stdin_data, env=None, cwd=None):
+    """Answer a validator call from the cache, validating only what is new.
+
+    `run` has the signature of hook_runtime.run_script. Any cache failure
+    falls back to running the validator on the full payload.
+    """
+    try:
+        payload = json.loads(stdin_data)
+        tool_input = payload.get("tool_input") or {}
+        file_path = tool_input.get("file_path")
+        content = tool_input.get("content")
+    except (ValueError, AttributeError):
+        return run(path, argv, stdin_data, env=env, cwd=cwd)
+    if not isinstance(file_path, str) or not isinstance(content, str) \
+            or ORCHESTRATE_MARKER not in file_path:
+        return run(path, argv, stdin_data, env=env, cwd=cwd)
+
+    try:
+        cache = get_cache()
+        file_type = os.path.basename(file_path)
+        version = validator_version(path)
+        key = _digest(f"{CACHE_FORMAT}\0{file_type}\0{version}\0{content}")
+        hit = cache.get(key)
+        if hit:
+            return insert_path(hit, file_path)
+        prev = cache.last_accepted(file_path, version) if file_type in APPEND_ONLY else None
+    except (sqlite3.Error, OSError):
+        return run(path, argv, stdin_data, env=env, cwd=cwd)
+
+    tail = incremental_tail(content, prev)
+    if tail is not None:
+        payload["tool_input"] = {**tool_input, "content": tail}
+        verdict = run(path, argv, json.dumps(payload).encode("utf-8"), env=env, cwd=cwd)
+    else:
+        verdict = run(path, argv, stdin_data, env=env, cwd=cwd)
+
+    if verdict[0] in CACHEABLE_STATUS:
+        try:
+            cache.put(key, strip_path(verdict, file_path))
+            if verdict[0] == 0 and file_type in APPEND_ONLY:
+                cache.accept(file_path, version, content)
+        except sqlite3.Error:
+            pass
+    return verdict
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""Incremental LEANN index maintenance for the research phase's EnsureIndex step.
+
+Tracks the git blob hash of every tracked file at the last build. `ensure`
+diffs the working tree against that (only files git reports as modified
+are re-hashed) and:
+
+    no changes      -> index is fresh, LEANN is not started at all
+    changes         -> `leann build` without --force, which re-chunks and
+                       re-embeds only added/modified files and drops deleted
+                       ones (IVF backend; HNSW indexes are add-only, so LEANN
+                       falls back to a full rebuild on modify/delete)
+    no index yet    -> full build, with the IVF backend so later updates
+                       stay incremental
+
+If a build exits 0 but leaves the index files untouched (e.g. LEANN skips
+an existing index), it is re-run with --force; file hashes are only
+recorded once the index was actually written.
+
+Indexes live in {project}/.leann/indexes/{name}. After each ensure, the
+least recently ensured indexes of other projects are removed until the
+total size fits the disk budget.
+
+Usage:
+    leann-index.py ensure [NAME] [--project DIR] [--budget-gb 10] [--dry-run]
+    leann-index.py status
+    leann-index.py evict [--budget-gb 10]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+STATE_DIR = Path.home() / ".cache" / "claude-code" / "leann"
+DEFAULT_BUDGET_GB = 10
+BUILD_FLAGS = ["--use-ast-chunking"]
+NEW_INDEX_FLAGS = ["--backend-name", "ivf"]
+# Incremental `build` without --force and the IVF backend need 0.3.8
+MIN_LEANN_VERSION = (0, 3, 8)
+VERSION_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)")
+
+
+def git(project, *args, input=None):
+    return subprocess.run(
+        ["git", "-C", str(project), *args],
+        input=input, capture_output=True, check=True,
+    ).stdout
+
+
+def tracked_files(project):
+    """{path: content hash} for tracked files as they are in the working tree"""
+    files = {}
+    for entry in git(project, "ls-files", "-s", "-z").split(b"\0"):
+        if not entry:
+            continue
+        meta, path = entry.split(b"\t", 1)
+        files[path.decode("utf-8", "surrogateescape")] = meta.split()[1].decode()
+    # Index blob hashes are stale for files edited but not staged: re-hash just those
+    modified = [p for p in git(project, "diff", "--name-only", "-z").decode(
+        "utf-8", "surrogateescape").split("\0") if p]
+    present = [p for p in modified if (project / p).is_file()]
+    for path in set(modified) - set(present):
+        files.pop(path, None)
+    if present:
+        hashes = git(project, "hash-object", "--stdin-paths",
+                     input="\n".join(present).encode("utf-8", "surrogateescape"))
+        files.update(zip(present, hashes.decode().split()))
+    return files
+
+
+def diff(old, new):
+    """(added, modified, deleted) path lists between two {path: hash} maps"""
+    added = [p for p in new if p not in old]
+    modified = [p for p in new if p in old and old[p] != new[p]]
+    deleted = [p for p in old if p not in new]
+    return added, modified, deleted
+
+
+def index_dir(project, name):
+    return Path(project) / ".leann" / "indexes" / name
+
+
+def index_snapshot(path):
+    """{file: (mtime_ns, size)} under an index directory, to tell whether a build wrote it"""
+    snapshot = {}
+    for root, _, files in os.walk(path):
+        for f in files:
+            full = os.path.join(root, f)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            snapshot[os.path.relpath(full, path)] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+def dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return total
+
+
+def state_path(project, name):
+    key = hashlib.sha256(str(project).encode()).hexdigest()[:12]
+    return STATE_DIR / f"{key}-{name}.json"
+
+
+def load_state(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_state(path, state):
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp", prefix=".leann-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def all_states():
+    for path in sorted(STATE_DIR.glob("*.json")):
+        state = load_state(path)
+        if state:
+            yield path, state
+
+
+def ensure(args):
+    project = Path(args.project).resolve()
+    name = args.name or project.name
+    spath = state_path(project, name)
+    state = load_state(spath)
+    exists = index_dir(project, name).exists()
+    try:
+        files = tracked_files(project)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"ERROR: not a git repository or git unavailable: {e}", file=sys.stderr)
+        return 1
+
+    command = ["leann", "build", name, *BUILD_FLAGS, "--docs", *sorted(files)]
+    if exists and state is not None:
+        added, modified, deleted = diff(state["files"], files)
+        if not (added or modified or deleted):
+            state["last_used"] = time.time()
+            if not args.dry_run:
+                save_state(spath, state)
+            print(f"FRESH: {name} ({len(files)} files unchanged)")
+            return evict(args, keep=spath)
+        summary = f"+{len(added)} ~{len(modified)} -{len(deleted)}"
+    else:
+        # No index, or one we never recorded: let LEANN sort out what it has
+        summary = f"{len(files)} files"
+        if not exists:
+            command[3:3] = NEW_INDEX_FLAGS
+
+    if args.dry_run:
+        print(f"DRY RUN: would update {name} ({summary}): {' '.join(command[:6])} ...")
+        return 0
+    leann = shutil.which("leann")
+    if leann is None:
+        print("ERROR: leann not found on PATH", file=sys.stderr)
+        return 1
+    version = leann_version(leann)
+    minimum = ".".join(map(str, MIN_LEANN_VERSION))
+    if version is None:
+        print(f"WARNING: could not determine the leann-core version, {minimum}+ is required",
+              file=sys.stderr)
+    elif version < MIN_LEANN_VERSION:
+        print(f"ERROR: leann-core {'.'.join(map(str, version))} is too old, {minimum}+ is "
+              f"required: uv tool upgrade leann-core", file=sys.stderr)
+        return 1
+    before = index_snapshot(index_dir(project, name))
+    result = subprocess.run(command, cwd=project)
+    if result.returncode == 0 and index_snapshot(index_dir(project, name)) == before:
+        # Nothing written (e.g. "already exists"): recording the new hashes
+        # would report a stale index as FRESH from now on
+        print(f"WARNING: leann build left {name} unchanged, rebuilding with --force",
+              file=sys.stderr)
+        # A full rebuild also moves an older HNSW index to IVF
+        command[3:3] = ["--force"] if NEW_INDEX_FLAGS[0] in command else ["--force", *NEW_INDEX_FLAGS]
+        result = subprocess.run(command, cwd=project)
+        if result.returncode == 0 and index_snapshot(index_dir(project, name)) == before:
+            print(f"ERROR: leann build --force did not write {name}", file=sys.stderr)
+            return 1
+    if result.returncode != 0:
+        print(f"ERROR: leann build failed ({summary})", file=sys.stderr)
+        return result.returncode
+
+    now = time.time()
+    save_state(spath, {"project": str(project), "name": name, "files": files,
+                       "built_at": now, "last_used": now})
+    print(f"OK: {'updated' if exists else 'built'} {name} ({summary})")
+    return evict(args, keep=spath)
+
+
+def leann_version(leann):
+    """Installed leann-core version as a tuple, or None if it cannot be told"""
+    # uv tool installs put the tool's interpreter next to its entry point
+    python = Path(os.path.realpath(leann)).parent / "python"
+    commands = [[str(python), "-c",
+                 "import importlib.metadata as m; print(m.version('leann-core'))"],
+                [leann, "--version"]]
+    for command in commands:
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        m = VERSION_RE.search(result.stdout) if result.returncode == 0 else None
+        if m:
+            return tuple(int(part) for part in m.groups())
+    return None
+
+
+def remove_index(state):
+    project, name = Path(state["project"]), state["name"]
+    if shutil.which("leann"):
+        result = subprocess.run(["leann", "remove", name, "--force"], cwd=project,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if result.returncode == 0 and not index_dir(project, name).exists():
+            return
+    shutil.rmtree(index_dir(project, name), ignore_errors=True)
+
+
+def evict(args, keep=None):
+    """Remove least recently used indexes until the total fits the budget"""
+    budget = int(args.budget_gb * 1024 ** 3)
+    entries = []
+    for path, state in all_states():
+        idx = index_dir(state["project"], state["name"])
+        if not idx.exists():
+            path.unlink()  # index removed outside our control
+            continue
+        entries.append((state.get("last_used", 0), path, state, dir_size(idx)))
+    total = sum(e[3] for e in entries)
+    for _, path, state, size in sorted(entries, key=lambda e: e[0]):
+        if total <= budget:
+            break
+        if path == keep:
+            continue
+        if getattr(args, "dry_run", False):
+            print(f"DRY RUN: would evict {state['name']} ({state['project']}, {size >> 20} MB)")
+        else:
+            remove_index(state)
+            path.unlink()
+            print(f"EVICTED: {state['name']} ({state['project']}, {size >> 20} MB)")
+        total -= size
+    return 0
+
+
+def status(args):
+    now = time.time()
+    for _, state in all_states():
+        idx = index_dir(state["project"], state["name"])
+        size = dir_size(idx) >> 20 if idx.exists() else 0
+        days = (now - state.get("last_used", 0)) / 86400
+        print(f"{state['name']:<24} {size:>7} MB  {days:5.1f}d ago  "
+              f"{len(state['files']):>7} files  {state['project']}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_ensure = sub.add_parser("ensure", help="build or incrementally update an index")
+    p_ensure.add_argument("name", nargs="?", help="index name (default: project dir name)")
+    p_ensure.add_argument("--project", default=".", help="git project root (default: cwd)")
+    p_ensure.add_argument("--dry-run", action="store_true")
+    p_evict = sub.add_parser("evict", help="enforce the disk budget")
+    p_evict.add_argument("--dry-run", action="store_true")
+    for p in (p_ensure, p_evict):
+        p.add_argument("--budget-gb", type=float, default=DEFAULT_BUDGET_GB)
+    sub.add_parser("status", help="list managed indexes")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    commands = {"ensure": ensure, "evict": evict, "status": status}
+    return commands[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
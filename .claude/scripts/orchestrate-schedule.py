@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""Dependency-aware critical-path scheduler for /orchestrate-execute.
+
+Reads the task table from plan/tasks.md and the Dependencies section of
+plan/plan.md, builds the task DAG and groups it into dependency waves
+(wave = 1 + deepest dependency wave). Ready tasks are dispatched longest
+critical path first, up to --concurrency at a time; a finished slot is
+refilled immediately instead of waiting for a fixed batch of 3 to drain.
+The review gate runs once per wave (execution/wave-N-review.md).
+
+Dependencies are read from a Depends/Dependencies column in tasks.md
+and/or lines of the plan.md Dependencies section such as:
+    - T3 depends on T1, T2        - T3: T1, T2
+    - T3 after T1                 - T1 -> T3   (T1 → T3)
+    - T3 requires T1              - T3 blocked by T1
+    - T1 before T3                - T1 blocks T3   (also: precedes)
+Lines saying tasks run in parallel or are independent are skipped; any
+other line naming two or more tasks without a direction is ignored with a
+warning on stderr. Durations come from an Estimate/Effort/Hours column
+(default 1 unit).
+
+The per-task/per-wave table is written to execution/_schedule.md;
+execution/_progress.md is append-only and only gets a one-line summary
+appended when the schedule state changes.
+
+Usage:
+    orchestrate-schedule.py plan SLUG [--concurrency 3] [--gate 0.5]
+    orchestrate-schedule.py ready SLUG       # tasks to dispatch now
+    orchestrate-schedule.py gates SLUG       # waves whose review gate is due
+    orchestrate-schedule.py progress SLUG    # write _schedule.md, append to _progress.md
+"""
+
+import argparse
+import heapq
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+DEFAULT_CONCURRENCY = 3
+DONE = {"complete", "completed", "done", "passed"}
+RUNNING = {"in-progress", "running", "executing"}
+# Never dispatched automatically; need a human or the debug cycle first
+HELD = {"failed", "blocked", "error", "escalated"}
+DEPENDS_RE = re.compile(r"\b(?:depends\s+on|after|requires|blocked\s+by)\b|:", re.I)
+# Reverse wording: IDs before the keyword are the prerequisites
+BEFORE_RE = re.compile(r"\b(?:before|blocks|precedes|unblocks)\b", re.I)
+# Lines stating there is no dependency, not worth a warning
+PARALLEL_RE = re.compile(r"\b(?:parallel|independent|concurrent(?:ly)?)\b", re.I)
+DEPENDS_COLUMNS = ("depends", "depends on", "dependencies", "deps", "blocked by")
+ESTIMATE_COLUMNS = ("estimate", "effort", "hours", "duration", "size")
+NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+SIZES = {"xs": 0.5, "s": 1, "m": 2, "l": 4, "xl": 8}
+
+
+class ScheduleError(Exception):
+    pass
+
+
+def split_row(line):
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def parse_tasks(text):
+    """[{id, title, status, deps, estimate}] from the first table with an ID column"""
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if not line.lstrip().startswith("|"):
+            continue
+        header = [h.lower().strip("* ") for h in split_row(line)]
+        if "id" not in header or i + 1 >= len(lines) or "-" not in lines[i + 1]:
+            continue
+        col = {name: header.index(name) for name in header}
+        depends_col = next((col[c] for c in DEPENDS_COLUMNS if c in col), None)
+        estimate_col = next((col[c] for c in ESTIMATE_COLUMNS if c in col), None)
+        tasks = []
+        for row_line in lines[i + 2:]:
+            if not row_line.lstrip().startswith("|"):
+                break
+            row = split_row(row_line)
+            row += [""] * (len(header) - len(row))
+            task_id = row[col["id"]].strip("* ")
+            if not task_id:
+                continue
+            tasks.append({
+                "id": task_id,
+                "title": row[col["title"]] if "title" in col else "",
+                "status": normalize_status(row[col["status"]]) if "status" in col else "pending",
+                "deps_text": row[depends_col] if depends_col is not None else "",
+                "estimate": parse_estimate(row[estimate_col]) if estimate_col is not None else 1.0,
+            })
+        return tasks
+    raise ScheduleError("no task table with an ID column found in tasks.md")
+
+
+def normalize_status(cell):
+    """'In Progress', 'in_progress', '**in-progress**' -> 'in-progress'"""
+    return re.sub(r"[\s_]+", "-", cell.strip("*` \t").lower())
+
+
+def parse_estimate(cell):
+    cell = cell.strip().lower()
+    if cell in SIZES:
+        return SIZES[cell]
+    m = NUMBER_RE.search(cell)
+    return float(m.group()) if m and float(m.group()) > 0 else 1.0
+
+
+def dependencies_section(plan_text):
+    """Body of the '## Dependencies' section of plan.md"""
+    m = re.search(r"^#+\s*Dependencies\s*$(.*?)(?=^#+\s|\Z)", plan_text, re.M | re.S | re.I)
+    return m.group(1) if m else ""
+
+
+def parse_dependencies(section, ids):
+    """{task: set(deps)} from Dependencies section lines, using only known task IDs.
+
+    A line naming two or more tasks that yields no dependency is reported
+    on stderr: silently dropping it could dispatch a task too early.
+    """
+    id_re = re.compile(r"\b(" + "|".join(re.escape(i) for i in sorted(ids, key=len, reverse=True)) + r")\b")
+    deps = {}
+    for line in section.splitlines():
+        found = id_re.findall(line)
+        if len(found) < 2:
+            continue
+        edges = []
+        if re.search(r"->|→", line):
+            # Chains: T1 -> T2 -> T3
+            parts = [id_re.findall(p) for p in re.split(r"->|→", line)]
+            for before, after in zip(parts, parts[1:]):
+                edges += [(a, b) for a in after for b in before]
+        else:
+            # "T3 depends on / after / requires / blocked by / : T1, T2"
+            # or reversed, "T1 before / blocks / precedes T3"
+            m, rm = DEPENDS_RE.search(line), BEFORE_RE.search(line)
+            if rm and (m is None or rm.start() < m.start()):
+                first, second = id_re.findall(line[:rm.start()]), id_re.findall(line[rm.end():])
+                edges = [(a, b) for a in second for b in first]
+            elif m:
+                first, second = id_re.findall(line[:m.start()]), id_re.findall(line[m.end():])
+                edges = [(a, b) for a in first for b in second]
+        if not edges and not PARALLEL_RE.search(line):
+            print(f"WARNING: ignoring dependency line, no direction found: {line.strip()}",
+                  file=sys.stderr)
+        for task, before in edges:
+            deps.setdefault(task, set()).add(before)
+    return deps
+
+
+def build_graph(tasks, plan_text):
+    ids = [t["id"] for t in tasks]
+    deps = {i: set() for i in ids}
+    id_re = re.compile(r"\b(" + "|".join(re.escape(i) for i in sorted(ids, key=len, reverse=True)) + r")\b")
+    for t in tasks:
+        deps[t["id"]].update(id_re.findall(t["deps_text"]))
+    for task, before in parse_dependencies(dependencies_section(plan_text), ids).items():
+        deps[task].update(before)
+    for task in ids:
+        deps[task].discard(task)
+    return deps
+
+
+def waves(ids, deps):
+    """{task: wave number (1-based)}; raises ScheduleError on a cycle"""
+    wave, visiting = {}, set()
+
+    def visit(task):
+        if task in wave:
+            return wave[task]
+        if task in visiting:
+            raise ScheduleError(f"dependency cycle through {task}")
+        visiting.add(task)
+        wave[task] = 1 + max((visit(d) for d in deps[task]), default=0)
+        visiting.discard(task)
+        return wave[task]
+
+    for task in ids:
+        visit(task)
+    return wave
+
+
+def critical_paths(ids, deps, duration):
+    """{task: longest duration from task start to the end of the DAG}"""
+    successors = {i: [] for i in ids}
+    for task, before in deps.items():
+        for d in before:
+            successors[d].append(task)
+    cp = {}
+
+    def visit(task):
+        if task not in cp:
+            cp[task] = duration[task] + max((visit(s) for s in successors[task]), default=0)
+        return cp[task]
+
+    for task in ids:
+        visit(task)
+    return cp
+
+
+def simulate_waves(ids, deps, duration, wave, cp, concurrency, gate):
+    """Projected makespan with critical-path dispatch and one gate per wave"""
+    remaining = {w: sum(1 for t in ids if wave[t] == w) for w in set(wave.values())}
+    gate_done = {}
+    done = set()
+    running = []  # (finish time, task)
+    started = set()
+    now = 0.0
+    gates = []  # (gate finish time, wave)
+    while len(done) < len(ids):
+        ready = [t for t in ids if t not in started
+                 and all(d in done and wave[d] in gate_done for d in deps[t])]
+        ready.sort(key=lambda t: -cp[t])
+        while ready and len(running) < concurrency:
+            task = ready.pop(0)
+            started.add(task)
+            heapq.heappush(running, (now + duration[task], task))
+        events = [e[0] for e in running[:1]] + [g[0] for g in gates[:1]]
+        if not events:
+            raise ScheduleError("scheduler stalled")
+        now = min(events)
+        while running and running[0][0] <= now:
+            _, task = heapq.heappop(running)
+            done.add(task)
+            remaining[wave[task]] -= 1
+            if remaining[wave[task]] == 0:
+                heapq.heappush(gates, (now + gate, wave[task]))
+        while gates and gates[0][0] <= now:
+            _, w = heapq.heappop(gates)
+            gate_done[w] = now
+    return max([now] + [g[0] for g in gates])
+
+
+def simulate_batches(ids, deps, duration, gate, size=DEFAULT_CONCURRENCY):
+    """Projected makespan of fixed batches of `size` in table order, gate per batch"""
+    batch_of, batches = {}, []
+    for task in ids:
+        earliest = 1 + max((batch_of[d] for d in deps[task] if d in batch_of), default=-1)
+        b = earliest
+        while b < len(batches) and len(batches[b]) >= size:
+            b += 1
+        while b >= len(batches):
+            batches.append([])
+        batches[b].append(task)
+        batch_of[task] = b
+    return sum(max(duration[t] for t in batch) + gate for batch in batches if batch), len(batches)
+
+
+def load(project, slug):
+    task_dir = Path(project) / "tmp" / ".orchestrate" / slug
+    tasks_md = task_dir / "plan" / "tasks.md"
+    plan_md = task_dir / "plan" / "plan.md"
+    if not tasks_md.exists():
+        raise ScheduleError(f"{tasks_md} not found")
+    tasks = parse_tasks(tasks_md.read_text())
+    plan_text = plan_md.read_text() if plan_md.exists() else ""
+    deps = build_graph(tasks, plan_text)
+    ids = [t["id"] for t in tasks]
+    duration = {t["id"]: t["estimate"] for t in tasks}
+    wave = waves(ids, deps)
+    cp = critical_paths(ids, deps, duration)
+    return task_dir, tasks, deps, wave, cp, duration
+
+
+def gate_passed(task_dir, w):
+    return (task_dir / "execution" / f"wave-{w}-review.md").exists()
+
+
+def cmd_plan(args):
+    task_dir, tasks, deps, wave, cp, duration = load(args.project, args.slug)
+    ids = [t["id"] for t in tasks]
+    for w in sorted(set(wave.values())):
+        members = sorted((t for t in ids if wave[t] == w), key=lambda t: -cp[t])
+        print(f"Wave {w}: " + ", ".join(f"{t} (cp {cp[t]:g})" for t in members))
+    critical = max(cp.values(), default=0)
+    projected = simulate_waves(ids, deps, duration, wave, cp, args.concurrency, args.gate)
+    batched, n_batches = simulate_batches(ids, deps, duration, args.gate)
+    print(f"\nCritical path: {critical:g}")
+    print(f"Projected wall-clock (critical-path, concurrency {args.concurrency}, "
+          f"{len(set(wave.values()))} wave gates): {projected:g}")
+    print(f"Current batching ({n_batches} batches of <= {DEFAULT_CONCURRENCY}, gate per batch): {batched:g}")
+    if batched:
+        print(f"Saving: {batched - projected:g} ({(batched - projected) / batched:.0%})")
+    return 0
+
+
+def cmd_ready(args):
+    task_dir, tasks, deps, wave, cp, _ = load(args.project, args.slug)
+    status = {t["id"]: t["status"] for t in tasks}
+    running = sum(1 for s in status.values() if s in RUNNING)
+    ready = [
+        t for t in status
+        if status[t] not in DONE | RUNNING | HELD
+        and all(status[d] in DONE and gate_passed(task_dir, wave[d]) for d in deps[t])
+    ]
+    ready.sort(key=lambda t: -cp[t])
+    for task in ready[:max(args.concurrency - running, 0)]:
+        print(task)
+    return 0
+
+
+def cmd_gates(args):
+    task_dir, tasks, _, wave, _, _ = load(args.project, args.slug)
+    status = {t["id"]: t["status"] for t in tasks}
+    for w in sorted(set(wave.values())):
+        members = [t for t in status if wave[t] == w]
+        if all(status[t] in DONE for t in members) and not gate_passed(task_dir, w):
+            print(f"wave-{w}: {', '.join(members)} -> execution/wave-{w}-review.md")
+    return 0
+
+
+def gate_state(task_dir, tasks, wave, w):
+    if gate_passed(task_dir, w):
+        return "passed"
+    if all(t["status"] in DONE for t in tasks if wave[t["id"]] == w):
+        return "due"
+    return "pending"
+
+
+def render_schedule(slug, tasks, wave, cp, task_dir, concurrency):
+    done = sum(1 for t in tasks if t["status"] in DONE)
+    lines = [
+        f"# Execution Schedule: {slug}",
+        "",
+        f"**Scheduler:** critical-path, concurrency {concurrency}, gate per dependency wave",
+        f"**Completed:** {done}/{len(tasks)}",
+        "",
+        "| Task | Title | Wave | Critical Path | Status |",
+        "|------|-------|------|---------------|--------|",
+    ]
+    for t in sorted(tasks, key=lambda t: (wave[t["id"]], -cp[t["id"]])):
+        lines.append(f"| {t['id']} | {t['title']} | {wave[t['id']]} | {cp[t['id']]:g} | {t['status']} |")
+    lines += ["", "## Wave Gates", "", "| Wave | Tasks | Gate |", "|------|-------|------|"]
+    for w in sorted(set(wave.values())):
+        members = [t["id"] for t in tasks if wave[t["id"]] == w]
+        lines.append(f"| {w} | {', '.join(members)} | {gate_state(task_dir, tasks, wave, w)} |")
+    return "\n".join(lines) + "\n"
+
+
+def progress_line(tasks, wave, task_dir):
+    """One-line scheduler summary for _progress.md"""
+    done = sum(1 for t in tasks if t["status"] in DONE)
+    running = [t["id"] for t in tasks if t["status"] in RUNNING]
+    held = [t["id"] for t in tasks if t["status"] in HELD]
+    gates = {w: gate_state(task_dir, tasks, wave, w) for w in sorted(set(wave.values()))}
+    passed = [w for w, state in gates.items() if state == "passed"]
+    due = [w for w, state in gates.items() if state == "due"]
+    parts = [f"{done}/{len(tasks)} complete"]
+    if running:
+        parts.append(f"running {', '.join(running)}")
+    if held:
+        parts.append(f"held {', '.join(held)}")
+    if passed:
+        parts.append(f"gates passed: wave {', '.join(map(str, passed))}")
+    if due:
+        parts.append(f"gate due: wave {', '.join(map(str, due))}")
+    return f"- Scheduler: {'; '.join(parts)}"
+
+
+def cmd_progress(args):
+    task_dir, tasks, _, wave, cp, _ = load(args.project, args.slug)
+    exec_dir = task_dir / "execution"
+    exec_dir.mkdir(parents=True, exist_ok=True)
+
+    path = exec_dir / "_schedule.md"
+    fd, tmp_path = tempfile.mkstemp(dir=exec_dir, suffix=".tmp", prefix=".schedule-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(render_schedule(args.slug, tasks, wave, cp, task_dir, args.concurrency))
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    print(f"OK: wrote {path}")
+
+    # _progress.md is append-only (see hooks/verdict_cache.py): never rewrite it
+    progress = exec_dir / "_progress.md"
+    line = progress_line(tasks, wave, task_dir)
+    try:
+        existing = progress.read_text()
+    except FileNotFoundError:
+        existing = f"# Execution Progress: {args.slug}\n\n"
+    last = [l for l in existing.splitlines() if l.startswith("- Scheduler: ")]
+    if last and last[-1] == line:
+        print(f"SKIP: {progress} already up to date")
+        return 0
+    with open(progress, "a") as f:
+        if not progress.stat().st_size:
+            f.write(existing)
+        elif not existing.endswith("\n"):
+            f.write("\n")
+        f.write(line + "\n")
+    print(f"OK: appended to {progress}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("plan", "ready", "gates", "progress"):
+        p = sub.add_parser(name)
+        p.add_argument("slug")
+        p.add_argument("--project", default=".", help="project root (default: cwd)")
+        p.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+        if name == "plan":
+            p.add_argument("--gate", type=float, default=0.0, help="review gate duration, same units as estimates")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    commands = {"plan": cmd_plan, "ready": cmd_ready, "gates": cmd_gates, "progress": cmd_progress}
+    try:
+        return commands[args.command](args)
+    except ScheduleError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""Latency regression suite for the hooks merge-settings.py installs.
+
+Replays synthetic PreToolUse, PostToolUse, SessionStart and SessionEnd
+payloads against each hook script over a small and a huge orchestrate
+tree, and reports per hook and tree:
+
+    cold p50/p95/p99  - each run in a fresh HOME (empty caches, no daemon)
+    warm p50/p95/p99  - repeated runs sharing one HOME after a warm-up
+    import            - sum of `python3 -X importtime` self times
+    rss               - peak RSS of the hook process (hook-client.py in daemon mode)
+    daemon            - daemon mode only: peak RSS (VmHWM) of the hook daemon,
+                        which each request's forked handler starts out as
+
+Budgets are the hook timeouts from merge-settings.py (session hooks have
+none, so SESSION_BUDGET_MS applies). A run fails if any warm p99 exceeds
+its budget, if a hook exits with anything but 0 or 2 (a crashing hook
+only looks fast), if no hook script was found to measure, or, with
+--baseline, if a warm p95 regresses past REGRESSION_FACTOR x baseline +
+REGRESSION_SLACK_MS.
+
+In daemon mode cold runs set CLAUDE_HOOK_DAEMON=off (no daemon yet, and
+none is auto-started into the throwaway HOME); the warm phase waits for
+the auto-started daemon and stops it before its HOME is removed.
+
+Usage:
+    python3 benchmarks/bench_hooks.py                          # scripts from .claude/
+    python3 benchmarks/bench_hooks.py --claude-dir ~/.claude --variant daemon
+    python3 benchmarks/bench_hooks.py --save-baseline benchmarks/hook-baseline.json
+    python3 benchmarks/bench_hooks.py --baseline benchmarks/hook-baseline.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import shlex
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SESSION_BUDGET_MS = 1000
+REGRESSION_FACTOR = 1.5
+REGRESSION_SLACK_MS = 5
+# Hook exit codes that are not failures: allow, or block with feedback
+OK_EXIT_CODES = {0, 2}
+DAEMON_START_TIMEOUT = 5
+
+# (tasks, research reports per task, size of each research summary in KB)
+TREES = {
+    "small": (2, 3, 4),
+    "huge": (200, 40, 2048),
+}
+
+
+def load_merge_settings():
+    spec = importlib.util.spec_from_file_location("merge_settings", ROOT / "merge-settings.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def installed_hooks(variant):
+    """[(event, script relative to ~/.claude, timeout_ms or None)] as merge-settings registers them"""
+    ms = load_merge_settings()
+    entries = [("PreToolUse", ms.ORCHESTRATOR_HOOK), ("PostToolUse", ms.STATS_COLLECTOR_HOOK)]
+    entries += [(event, hook) for event, hooks in ms.SESSION_HOOKS.items() for hook in hooks]
+    result = []
+    for event, hook in entries:
+        if variant == "daemon":
+            hook = ms.with_variant(hook, True)
+        for h in hook["hooks"]:
+            result.append((event, h["command"], h.get("timeout")))
+    return result
+
+
+def build_tree(project, tasks, reports, summary_kb, seed=0):
+    rng = random.Random(seed)
+    filler = "- Finding {n}: module {n} handles request routing via middleware\n"
+    for t in range(tasks):
+        task = project / "tmp" / ".orchestrate" / f"task-{t}"
+        for sub in ("research", "plan", "execution"):
+            (task / sub).mkdir(parents=True)
+        (task / "task.md").write_text(f"# Task: task-{t}\n\nStatus: executing\nComplexity: 4\n")
+        (task / "plan" / "tasks.md").write_text(
+            "| ID | Title | Status |\n|----|-------|--------|\n"
+            + "".join(f"| T{i} | Step {i} | pending |\n" for i in range(20))
+        )
+        (task / "execution" / "_progress.md").write_text(
+            "# Progress\n" + "".join(f"- T{i}: complete\n" for i in range(20))
+        )
+        for r in range(reports):
+            (task / "research" / f"agent-{r}.md").write_text(filler.format(n=r) * 50)
+        lines = summary_kb * 1024 // len(filler)
+        (task / "research" / "_summary.md").write_text(
+            "# Summary\n## Key Findings\n"
+            + "".join(filler.format(n=rng.randrange(10000)) for _ in range(lines))
+            + "## Coverage\nSearch-mode: hybrid\n## Gaps\nNone\n"
+        )
+
+
+def payloads(event, project):
+    """Synthetic hook inputs for an event against the project tree"""
+    base = {"session_id": "bench", "cwd": str(project), "hook_event_name": event}
+    if event in ("SessionStart", "SessionEnd"):
+        return [{**base, "source": "startup"} if event == "SessionStart" else {**base, "reason": "exit"}]
+    task = project / "tmp" / ".orchestrate" / "task-0"
+    files = [
+        task / "task.md",
+        task / "plan" / "tasks.md",
+        task / "execution" / "_progress.md",
+        task / "research" / "_summary.md",
+    ]
+    result = []
+    for path in files:
+        content = path.read_text()
+        if path.name == "_progress.md":
+            content += "- T20: complete\n"
+        tool_input = {"file_path": str(path), "content": content}
+        result.append({**base, "tool_name": "Write", "tool_input": tool_input})
+    result.append({**base, "tool_name": "Write",
+                   "tool_input": {"file_path": str(project / "src" / "app.py"), "content": "x = 1\n"}})
+    return result
+
+
+def make_home(claude_dir, parent):
+    """Fresh HOME with the hook scripts copied into ~/.claude"""
+    home = Path(tempfile.mkdtemp(dir=parent, prefix="home-"))
+    for sub in ("validators", "hooks"):
+        if (claude_dir / sub).is_dir():
+            shutil.copytree(claude_dir / sub, home / ".claude" / sub)
+    return home
+
+
+def run_hook(argv, payload, home, project, extra_flags=(), extra_env=None):
+    """Run one hook; returns (elapsed_ms, exit_code, max_rss_kb, stderr)"""
+    env = {**os.environ, "HOME": str(home), "CLAUDE_PROJECT_DIR": str(project), **(extra_env or {})}
+    data = json.dumps(payload).encode("utf-8")
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen([argv[0], *extra_flags, *argv[1:]], stdin=subprocess.PIPE,
+                                stdout=out, stderr=err, cwd=project, env=env)
+        try:
+            proc.stdin.write(data)
+        except BrokenPipeError:
+            pass
+        proc.stdin.close()
+        _, status, usage = os.wait4(proc.pid, 0)
+        elapsed = (time.perf_counter() - start) * 1000
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        err.seek(0)
+        return elapsed, proc.returncode, usage.ru_maxrss, err.read().decode("utf-8", "replace")
+
+
+def daemon_rss_kb(home):
+    """Peak RSS (VmHWM) of the daemon running for home, or None if unknown (non-Linux)"""
+    pid_file = home / ".cache" / "claude-code" / "hook-daemon.pid"
+    try:
+        pid = int(pid_file.read_text().strip())
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def import_ms(stderr):
+    total = 0
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            field = line.split(":", 1)[1].split("|")[0].strip()
+            if field.isdigit():
+                total += int(field)
+    return total / 1000
+
+
+def pct(samples, q):
+    if len(samples) < 2:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1]
+
+
+def bench_case(command, event, tree, claude_dir, work, runs):
+    project = work / f"project-{tree}"
+    cases = payloads(event, project)
+    argv = shlex.split(command.replace("~/.claude", "{home}/.claude"))
+    argv[0] = sys.executable if argv[0] == "python3" else argv[0]
+
+    def resolve(home):
+        return [a.replace("{home}", str(home)) for a in argv]
+
+    daemon = "hook-client.py" in command
+    cold, codes = [], set()
+    for i in range(runs):
+        home = make_home(claude_dir, work)
+        elapsed, code, _, _ = run_hook(resolve(home), cases[i % len(cases)], home, project,
+                                       extra_env={"CLAUDE_HOOK_DAEMON": "off"})
+        cold.append(elapsed)
+        codes.add(code)
+        shutil.rmtree(home, ignore_errors=True)
+
+    home = make_home(claude_dir, work)
+    for payload in cases:
+        run_hook(resolve(home), payload, home, project)
+    if daemon:
+        wait_for_daemon(home)
+    warm, rss = [], 0
+    for i in range(runs):
+        elapsed, code, max_rss, _ = run_hook(resolve(home), cases[i % len(cases)], home, project)
+        warm.append(elapsed)
+        codes.add(code)
+        rss = max(rss, max_rss)
+    _, _, _, stderr = run_hook(resolve(home), cases[0], home, project, extra_flags=("-X", "importtime"))
+    daemon_rss = None
+    if daemon:
+        daemon_rss = daemon_rss_kb(home)
+        stop_daemon(home)
+    shutil.rmtree(home, ignore_errors=True)
+
+    return {
+        "cold": {f"p{q}": round(pct(cold, q), 1) for q in (50, 95, 99)},
+        "warm": {f"p{q}": round(pct(warm, q), 1) for q in (50, 95, 99)},
+        "import_ms": round(import_ms(stderr), 1),
+        "rss_mb": round(rss / 1024, 1),
+        "daemon_rss_mb": None if daemon_rss is None else round(daemon_rss / 1024, 1),
+        "exit_codes": sorted(codes),
+    }
+
+
+def wait_for_daemon(home, timeout=DAEMON_START_TIMEOUT):
+    """Wait until the daemon auto-started in home has written its PID file"""
+    pid_file = home / ".cache" / "claude-code" / "hook-daemon.pid"
+    deadline = time.monotonic() + timeout
+    while not pid_file.exists():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def stop_daemon(home):
+    """Stop the daemon of a bench HOME; waits for it first so a slow start is not missed"""
+    daemon = home / ".claude" / "hooks" / "hook-daemon.py"
+    if daemon.exists():
+        wait_for_daemon(home)
+        subprocess.run([sys.executable, str(daemon), "stop"], env={**os.environ, "HOME": str(home)},
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def check(results, hooks, baseline):
+    """Budget and regression failures as human-readable strings"""
+    failures = []
+    budgets = {f"{event} {Path(shlex.split(cmd)[-1]).name}": timeout for event, cmd, timeout in hooks}
+    for key, result in results.items():
+        hook_key, tree = key.rsplit(" @ ", 1)
+        budget = budgets.get(hook_key) or SESSION_BUDGET_MS
+        bad = sorted(set(result["exit_codes"]) - OK_EXIT_CODES)
+        if bad:
+            failures.append(f"{key}: exit code(s) {bad} (hook crashed or errored)")
+        p99 = result["warm"]["p99"]
+        if p99 > budget:
+            failures.append(f"{key}: warm p99 {p99} ms over {budget} ms budget")
+        old = (baseline or {}).get(key)
+        if old:
+            limit = old["warm"]["p95"] * REGRESSION_FACTOR + REGRESSION_SLACK_MS
+            if result["warm"]["p95"] > limit:
+                failures.append(f"{key}: warm p95 {result['warm']['p95']} ms regressed "
+                                f"(baseline {old['warm']['p95']} ms, limit {limit:.1f} ms)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claude-dir", type=Path, default=ROOT / ".claude",
+                        help="directory holding validators/ and hooks/ (default: repo .claude)")
+    parser.add_argument("--variant", choices=("plain", "daemon"), default="plain")
+    parser.add_argument("--trees", default=",".join(TREES), help="comma-separated: " + ",".join(TREES))
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--baseline", type=Path, help="fail on regressions against this baseline")
+    parser.add_argument("--save-baseline", type=Path, help="write results as the new baseline")
+    args = parser.parse_args()
+
+    claude_dir = args.claude_dir.expanduser().resolve()
+    hooks = installed_hooks(args.variant)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        trees = [t for t in args.trees.split(",") if t]
+        for tree in trees:
+            build_tree(work / f"project-{tree}", *TREES[tree])
+
+        print(f"{'hook':<44} {'tree':<6} {'cold p50/p95/p99 ms':>22} {'warm p50/p95/p99 ms':>22} "
+              f"{'import':>7} {'rss':>7}" + (f" {'daemon':>7}" if args.variant == "daemon" else ""))
+        for event, command, _ in hooks:
+            script = shlex.split(command)[-1].replace("~/.claude/", "")
+            name = f"{event} {Path(script).name}"
+            if not (claude_dir / script).exists():
+                print(f"{name:<44} SKIP ({claude_dir / script} not found)")
+                continue
+            for tree in trees:
+                r = bench_case(command, event, tree, claude_dir, work, args.runs)
+                results[f"{name} @ {tree}"] = r
+                cold = "/".join(str(v) for v in r["cold"].values())
+                warm = "/".join(str(v) for v in r["warm"].values())
+                line = (f"{name:<44} {tree:<6} {cold:>22} {warm:>22} "
+                        f"{r['import_ms']:>5.1f}ms {r['rss_mb']:>5.1f}MB")
+                if args.variant == "daemon":
+                    daemon_rss = r["daemon_rss_mb"]
+                    line += f" {daemon_rss:>5.1f}MB" if daemon_rss is not None else f" {'-':>7}"
+                print(line)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"OK: baseline saved to {args.save_baseline}")
+
+    failures = check(results, hooks, baseline)
+    if not results:
+        failures.append(f"no hook scripts found under {claude_dir}; nothing was measured "
+                        f"(use --claude-dir ~/.claude)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        return 1
+    print(f"OK: {len(results)} hook/tree combinations within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for .claude/validators/secrets_scan.py.
+
+Generates synthetic orchestrate artifacts (research summaries, agent
+reports, progress logs) of several sizes and compares the streaming
+single-pass scanner with applying each pattern separately to the whole
+file, as the validator does today. Output is best-of-N MB/s.
+
+Usage:
+    python3 benchmarks/bench_secrets_scan.py [--sizes 1,4,16] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / ".claude" / "validators"))
+import secrets_scan  # noqa: E402
+
+# Realistic filler: markdown tables, code fences, URLs and near-miss literals
+LINES = [
+    "## Key Findings",
+    "| ID | Title | Status |",
+    "|----|-------|--------|",
+    "| T{n} | Refactor module {n} | complete |",
+    "- See https://docs.example.com/guide/{n} for the password reset flow",
+    "- The task-{n} handler reads the password from the environment, never a literal",
+    "```python",
+    "def handler_{n}(request):",
+    "    return render(request, 'page-{n}.html', {{'user': request.user}})",
+    "```",
+    "Coverage: Search-mode=hybrid, Semantic-hits={n}, Keyword-hits={n}",
+    "[{n}] Batch gate APPROVED after desk-check of sk-style naming",
+    "",
+]
+
+
+def make_artifact(path, size_mb, seed=0):
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, "w") as f:
+        while written < target:
+            line = rng.choice(LINES).format(n=rng.randrange(10000)) + "\n"
+            f.write(line)
+            written += len(line)
+        # One real finding near the end so the full file must be scanned
+        f.write('api_key = "sk-' + "x" * 40 + '"\n')
+
+
+def naive_scan(path, patterns):
+    """Baseline: load whole file, run every pattern separately"""
+    text = Path(path).read_text(encoding="utf-8", errors="replace")
+    compiled = [re.compile(p.regex) for p in patterns]
+    return [m.start() for regex in compiled for m in regex.finditer(text)]
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,4,16", help="artifact sizes in MB (comma-separated)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    patterns = secrets_scan.DEFAULT_PATTERNS
+    scanner = secrets_scan.Scanner(patterns)
+    print(f"{'size':>6}  {'per-pattern':>12}  {'combined':>12}  {'speedup':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(",")):
+            path = Path(tmp) / f"_summary-{size}mb.md"
+            make_artifact(path, size)
+            mb = path.stat().st_size / (1024 * 1024)
+            naive = best_of(args.repeat, lambda: naive_scan(path, patterns))
+            engine = best_of(args.repeat, lambda: scanner.scan_file(path))
+            assert scanner.scan_file(path), "planted secret not found"
+            print(f"{size:>4}MB  {mb / naive:>8.1f}MB/s  {mb / engine:>8.1f}MB/s  {naive / engine:>6.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
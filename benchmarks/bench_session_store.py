@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""SessionStart latency for .claude/hooks/session_store.py.
+
+Builds a synthetic machine state (many projects, sessions and orchestrate
+tasks) in a temp dir, then measures, in fresh interpreters, the time to
+produce the SessionStart context two ways:
+
+    legacy  - glob every session file + every tmp/.orchestrate/*/task.md
+    indexed - open state.db and run startup_context(), which syncs the
+              project's task rows (scandir + stat per task) before reading
+
+Exits 1 if the indexed p95 exceeds --budget-ms.
+
+Usage:
+    python3 benchmarks/bench_session_store.py [--projects 300] [--sessions 2000] [--budget-ms 50]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HOOKS_DIR = ROOT / ".claude" / "hooks"
+sys.path.insert(0, str(HOOKS_DIR))
+import session_store  # noqa: E402
+
+STATUSES = ["researching", "planning", "executing", "complete", "complete", "blocked"]
+
+LEGACY = """
+import json, sys
+from pathlib import Path
+sessions_dir, project_dir = Path(sys.argv[1]), sys.argv[2]
+last = None
+for path in sessions_dir.glob("*.json"):
+    data = json.loads(path.read_text())
+    if data["cwd"] == project_dir and (last is None or data["timestamp"] > last["timestamp"]):
+        last = data
+active = []
+for task_md in Path(project_dir, "tmp", ".orchestrate").glob("*/task.md"):
+    if "Status: complete" not in task_md.read_text():
+        active.append(task_md.parent.name)
+"""
+
+INDEXED = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from pathlib import Path
+import session_store
+store = session_store.SessionStore(Path(sys.argv[2]))
+store.startup_context(sys.argv[3], sync=True)  # what SessionStart does, sync_tasks() included
+"""
+
+
+def build_state(tmp, projects, sessions, tasks_per_project, seed=0):
+    rng = random.Random(seed)
+    sessions_dir = tmp / "sessions"
+    sessions_dir.mkdir()
+    project_dirs = []
+    for p in range(projects):
+        project = tmp / "projects" / f"project-{p}"
+        for t in range(tasks_per_project):
+            task_dir = project / "tmp" / ".orchestrate" / f"task-{t}"
+            task_dir.mkdir(parents=True)
+            (task_dir / "task.md").write_text(
+                f"# Task: task-{t}\n\nStatus: {rng.choice(STATUSES)}\nComplexity: 3\n"
+            )
+        project_dirs.append(str(project))
+    now = time.time()
+    for s in range(sessions):
+        data = {
+            "session_id": f"s{s}",
+            "cwd": rng.choice(project_dirs),
+            "slug": f"task-{rng.randrange(tasks_per_project)}",
+            "phase": "execute",
+            "timestamp": now - rng.randrange(90 * 86400),
+        }
+        (sessions_dir / f"s{s}.json").write_text(json.dumps(data))
+    db_path = tmp / "state.db"
+    store = session_store.SessionStore(db_path)
+    store.migrate_legacy(sessions_dir)
+    for project in project_dirs:
+        store.sync_tasks(project)
+    store.close()
+    return sessions_dir, db_path, project_dirs
+
+
+def time_runs(argv, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def pct(samples, q):
+    return statistics.quantiles(samples, n=100)[q - 1] if len(samples) > 1 else samples[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=300)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=5, help="orchestrate tasks per project")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sessions_dir, db_path, project_dirs = build_state(Path(tmp), args.projects, args.sessions, args.tasks)
+        project = project_dirs[0]
+        baseline = time_runs([sys.executable, "-c", "pass"], args.runs)
+        legacy = time_runs([sys.executable, "-c", LEGACY, str(sessions_dir), project], args.runs)
+        indexed = time_runs([sys.executable, "-c", INDEXED, str(HOOKS_DIR), str(db_path), project], args.runs)
+
+    startup = statistics.median(baseline)
+    print(f"{args.projects} projects, {args.sessions} sessions, {args.tasks} tasks/project "
+          f"(interpreter startup {startup:.1f} ms subtracted)")
+    for name, samples in (("legacy", legacy), ("indexed", indexed)):
+        net = [s - startup for s in samples]
+        print(f"{name:>8}  p50 {pct(net, 50):7.1f} ms  p95 {pct(net, 95):7.1f} ms")
+    p95 = pct([s - startup for s in indexed], 95)
+    if p95 > args.budget_ms:
+        print(f"FAIL: indexed p95 {p95:.1f} ms over budget {args.budget_ms:.0f} ms")
+        return 1
+    print(f"OK: indexed p95 within {args.budget_ms:.0f} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
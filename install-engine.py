@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Manifest-driven install/upgrade/uninstall of workflow files into ~/.claude.
+
+Every installed file is recorded with its SHA-256 in
+~/.claude/.workflow-manifest.json. On the next run a file is only copied
+(and backed up) when its content differs from the repo; files whose
+current hash no longer matches the manifest were edited by the user and
+are left alone unless --force is given. Settings hooks are merged
+in-process through merge-settings.py.
+
+Usage:
+    install-engine.py install [--upgrade] [--force] [--dry-run] [--daemon|--no-daemon]
+    install-engine.py uninstall [--force] [--dry-run]
+"""
+
+import argparse
+import copy
+import difflib
+import hashlib
+import importlib.util
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SOURCE_DIR = SCRIPT_DIR / ".claude"
+CLAUDE_DIR = Path.home() / ".claude"
+MANIFEST_FILE = CLAUDE_DIR / ".workflow-manifest.json"
+
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+BLUE = "\033[0;34m"
+NC = "\033[0m"
+
+# Files the hook daemon runs in-process; it must restart when any of them change
+DAEMON_DIRS = ("hooks/", "validators/")
+
+# (title, glob relative to .claude/, refresh) — refresh components are updated on
+# every install; the rest only on --upgrade, matching the original install.sh
+COMPONENTS = [
+    ("Orchestrator Rules", "orchestrator-rules.md", False),
+    ("Commands", "commands/*.md", False),
+    ("Agents", "agents/*.md", False),
+    ("Agents (core)", "agents/core/*.md", False),
+    ("Rules", "rules/*.md", False),
+    ("Docs", "docs/*.md", False),
+    ("Validators", "validators/*.py", True),
+    ("Hooks", "hooks/*.py", True),
+    ("Scripts", "scripts/*.py", True),
+]
+
+
+def load_merge_settings():
+    spec = importlib.util.spec_from_file_location("merge_settings", SCRIPT_DIR / "merge-settings.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_FILE) as f:
+            return json.load(f).get("files", {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(files, merge_settings):
+    merge_settings.atomic_write_json(MANIFEST_FILE, {"version": 1, "files": dict(sorted(files.items()))})
+
+
+def show_diff(src, dst, rel):
+    try:
+        old = dst.read_text().splitlines(keepends=True)
+        new = src.read_text().splitlines(keepends=True)
+    except UnicodeDecodeError:
+        print("      (binary file differs)")
+        return
+    for line in difflib.unified_diff(old, new, f"installed/{rel}", f"repo/{rel}"):
+        print(f"      {line}", end="" if line.endswith("\n") else "\n")
+
+
+def plan_file(src, dst, rel, manifest, refresh, force):
+    """Action for one file: install, update, unchanged, skip or modified"""
+    if not dst.exists():
+        return "install"
+    current = file_hash(dst)
+    if current == file_hash(src):
+        return "unchanged"
+    recorded = manifest.get(rel)
+    if recorded is not None and current != recorded and not force:
+        return "modified"
+    if not refresh:
+        return "skip"
+    return "update"
+
+
+def stop_daemon():
+    """Stop a running hook daemon so the next hook call starts one on the new code"""
+    daemon = CLAUDE_DIR / "hooks" / "hook-daemon.py"
+    if not daemon.exists():
+        return
+    result = subprocess.run([sys.executable, str(daemon), "stop"], capture_output=True, text=True)
+    if result.stdout.startswith("OK:"):
+        print(f"  {YELLOW}↻{NC} hook daemon stopped (restarts on next hook call)")
+
+
+def install_settings(merge_settings, args):
+    """Merge the workflow hooks into settings.json, showing a diff on --dry-run"""
+    settings_file = merge_settings.SETTINGS_FILE
+    settings = merge_settings.load_settings(settings_file)
+    before = copy.deepcopy(settings)
+    changes = merge_settings.apply_hooks(settings, args.daemon)
+    if not changes:
+        print(f"  {YELLOW}⊘{NC} Hook already configured")
+        return
+    print(f"  {GREEN}✓{NC} settings.json: {', '.join(changes)}")
+    if args.dry_run:
+        old = json.dumps(before, indent=2).splitlines(keepends=True)
+        new = json.dumps(settings, indent=2).splitlines(keepends=True)
+        for line in difflib.unified_diff(old, new, "settings.json", "settings.json (merged)"):
+            print(f"      {line}", end="" if line.endswith("\n") else "\n")
+        return
+    settings_file.parent.mkdir(parents=True, exist_ok=True)
+    merge_settings.backup_settings(settings_file)
+    merge_settings.atomic_write_json(settings_file, settings)
+
+
+def install(args):
+    merge_settings = load_merge_settings()
+    manifest = load_manifest()
+    new_manifest = dict(manifest)
+    backup_dir = CLAUDE_DIR / time.strftime(".backup-%Y%m%d-%H%M%S")
+    counts = {}
+    daemon_files_changed = False
+    # Component steps, then settings hooks here, then LEANN in install.sh
+    total = len({title.split(" (")[0] for title, _, _ in COMPONENTS}) + 2
+
+    step = 0
+    for title, pattern, refresh in COMPONENTS:
+        if not title.endswith(")"):
+            step += 1
+            if step > 1:
+                print()
+            print(f"{BLUE}[{step}/{total}] {title}{NC}")
+        for src in sorted(SOURCE_DIR.glob(pattern)):
+            if not src.is_file():
+                continue
+            rel = src.relative_to(SOURCE_DIR).as_posix()
+            dst = CLAUDE_DIR / rel
+            action = plan_file(src, dst, rel, manifest, refresh or args.upgrade, args.force)
+            counts[action] = counts.get(action, 0) + 1
+            if action == "unchanged":
+                new_manifest[rel] = file_hash(src)
+                continue
+            if action == "skip":
+                print(f"  {YELLOW}⊘{NC} {rel} (already exists, skipped)")
+                continue
+            if action == "modified":
+                print(f"  {YELLOW}⊘{NC} {rel} (modified locally, kept — use --force to overwrite)")
+                continue
+            if action == "install":
+                print(f"  {GREEN}✓{NC} {rel}")
+            else:
+                print(f"  {YELLOW}↻{NC} {rel} (backup in .backup-*)")
+                if args.dry_run:
+                    show_diff(src, dst, rel)
+            if args.dry_run:
+                continue
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            if action == "update":
+                backup = backup_dir / rel
+                backup.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(dst, backup)
+            shutil.copy2(src, dst)
+            new_manifest[rel] = file_hash(dst)
+            daemon_files_changed |= rel.startswith(DAEMON_DIRS)
+
+    if daemon_files_changed:
+        stop_daemon()
+
+    # Settings hooks via merge-settings.py, in-process (last step is LEANN, run by install.sh)
+    print(f"\n{BLUE}[{step + 1}/{total}] Settings hooks{NC}")
+    try:
+        install_settings(merge_settings, args)
+    except (OSError, ValueError) as e:
+        # Files are already copied: still record them and let install.sh go on to LEANN
+        print(f"  {RED}✗{NC} Error: {merge_settings.SETTINGS_FILE}: {e}")
+
+    if not args.dry_run:
+        CLAUDE_DIR.mkdir(parents=True, exist_ok=True)
+        save_manifest(new_manifest, merge_settings)
+
+    summary = ", ".join(f"{n} {action}" for action, n in sorted(counts.items()))
+    prefix = "DRY RUN: would apply" if args.dry_run else "OK:"
+    print(f"\n{prefix} {summary or 'nothing to install'}")
+    if backup_dir.exists():
+        print(f"{YELLOW}Backups saved in: {backup_dir}{NC}")
+    return 0
+
+
+def uninstall(args):
+    manifest = load_manifest()
+    if not manifest:
+        print("SKIP: no install manifest")
+        return 1
+    kept = {}
+    for rel, recorded in sorted(manifest.items()):
+        path = CLAUDE_DIR / rel
+        if not path.exists():
+            continue
+        if file_hash(path) != recorded and not args.force:
+            print(f"  {YELLOW}⊘{NC} {rel} (modified locally, kept — use --force to remove)")
+            kept[rel] = recorded
+            continue
+        print(f"  {RED}✗{NC} {rel}")
+        if not args.dry_run:
+            path.unlink()
+    if args.dry_run:
+        return 0
+    if kept:
+        save_manifest(kept, load_merge_settings())
+    else:
+        MANIFEST_FILE.unlink()
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    inst = sub.add_parser("install", help="install or upgrade workflow files")
+    inst.add_argument("--upgrade", "-u", action="store_true", help="also update commands, agents, rules, docs")
+    variant = inst.add_mutually_exclusive_group()
+    variant.add_argument("--daemon", dest="daemon", action="store_true", default=None)
+    variant.add_argument("--no-daemon", dest="daemon", action="store_false")
+    rm = sub.add_parser("uninstall", help="remove files recorded in the manifest")
+    for p in (inst, rm):
+        p.add_argument("--force", action="store_true", help="also overwrite/remove locally modified files")
+        p.add_argument("--dry-run", action="store_true", help="show what would change without writing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "install":
+        return install(args)
+    return uninstall(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
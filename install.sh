@@ -7,19 +7,27 @@ set -e
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 CLAUDE_DIR="$HOME/.claude"
-BACKUP_DIR="$CLAUDE_DIR/.backup-$(date +%Y%m%d-%H%M%S)"
 UPGRADE_MODE=false
 SKIP_LEANN=false
+DRY_RUN=false
+ENGINE_ARGS=()
 
 # Parse arguments
 while [[ "$#" -gt 0 ]]; do
     case $1 in
-        --upgrade|-u) UPGRADE_MODE=true ;;
+        --upgrade|-u) UPGRADE_MODE=true; ENGINE_ARGS+=("--upgrade") ;;
         --no-leann) SKIP_LEANN=true ;;
+        --dry-run) DRY_RUN=true; ENGINE_ARGS+=("--dry-run") ;;
+        --force) ENGINE_ARGS+=("--force") ;;
+        --daemon|--no-daemon) ENGINE_ARGS+=("$1") ;;
         --help|-h)
-            echo "Usage: ./install.sh [--upgrade] [--no-leann]"
-            echo "  --upgrade, -u  Force update all files (backup existing)"
+            echo "Usage: ./install.sh [--upgrade] [--dry-run] [--force] [--no-leann] [--daemon|--no-daemon]"
+            echo "  --upgrade, -u  Update all changed files (backup existing)"
+            echo "  --dry-run      Show what would change (with diffs) without writing"
+            echo "  --force        Also overwrite files you modified locally"
             echo "  --no-leann     Skip LEANN semantic search installation"
+            echo "  --daemon       Run Write hooks through the persistent hook daemon"
+            echo "  --no-daemon    Switch Write hooks back to plain python3 commands"
             exit 0
             ;;
         *) echo "Unknown option: $1"; exit 1 ;;
@@ -49,139 +57,15 @@ if [ ! -d "$CLAUDE_DIR" ]; then
     mkdir -p "$CLAUDE_DIR"
 fi
 
-# Copy function with existence check
-copy_if_not_exists() {
-    local src="$1"
-    local dst="$2"
-    local name=$(basename "$src")
+# 1-9. Workflow files + settings.json hooks (manifest-driven, see install-engine.py)
+python3 "$SCRIPT_DIR/install-engine.py" install "${ENGINE_ARGS[@]}"
 
-    if [ -e "$dst" ]; then
-        echo -e "  ${YELLOW}⊘${NC} $name (already exists, skipped)"
-        return 1
-    else
-        cp "$src" "$dst"
-        echo -e "  ${GREEN}✓${NC} $name"
-        return 0
-    fi
-}
-
-# Copy function with backup
-copy_with_backup() {
-    local src="$1"
-    local dst="$2"
-    local name=$(basename "$src")
-
-    if [ -e "$dst" ]; then
-        mkdir -p "$BACKUP_DIR"
-        cp "$dst" "$BACKUP_DIR/$name"
-        cp "$src" "$dst"
-        echo -e "  ${YELLOW}↻${NC} $name (backup in .backup-*)"
-    else
-        cp "$src" "$dst"
-        echo -e "  ${GREEN}✓${NC} $name"
-    fi
-}
-
-# 1. Install orchestrator rules (root level)
-echo -e "${BLUE}[1/8] Orchestrator Rules${NC}"
-if [ -f "$SCRIPT_DIR/.claude/orchestrator-rules.md" ]; then
-    if [ "$UPGRADE_MODE" = true ]; then
-        copy_with_backup "$SCRIPT_DIR/.claude/orchestrator-rules.md" "$CLAUDE_DIR/orchestrator-rules.md"
-    else
-        copy_if_not_exists "$SCRIPT_DIR/.claude/orchestrator-rules.md" "$CLAUDE_DIR/orchestrator-rules.md" || true
-    fi
+if [ "$DRY_RUN" = true ]; then
+    exit 0
 fi
 
-# 2. Install commands
-echo -e "\n${BLUE}[2/8] Commands${NC}"
-mkdir -p "$CLAUDE_DIR/commands"
-for cmd in "$SCRIPT_DIR/.claude/commands"/*.md; do
-    if [ -f "$cmd" ]; then
-        if [ "$UPGRADE_MODE" = true ]; then
-            copy_with_backup "$cmd" "$CLAUDE_DIR/commands/$(basename "$cmd")"
-        else
-            copy_if_not_exists "$cmd" "$CLAUDE_DIR/commands/$(basename "$cmd")" || true
-        fi
-    fi
-done
-
-# 3. Install agents
-echo -e "\n${BLUE}[3/8] Agents${NC}"
-mkdir -p "$CLAUDE_DIR/agents/core"
-
-for agent in "$SCRIPT_DIR/.claude/agents"/*.md; do
-    if [ -f "$agent" ]; then
-        if [ "$UPGRADE_MODE" = true ]; then
-            copy_with_backup "$agent" "$CLAUDE_DIR/agents/$(basename "$agent")"
-        else
-            copy_if_not_exists "$agent" "$CLAUDE_DIR/agents/$(basename "$agent")" || true
-        fi
-    fi
-done
-
-for agent in "$SCRIPT_DIR/.claude/agents/core"/*.md; do
-    if [ -f "$agent" ]; then
-        if [ "$UPGRADE_MODE" = true ]; then
-            copy_with_backup "$agent" "$CLAUDE_DIR/agents/core/$(basename "$agent")"
-        else
-            copy_if_not_exists "$agent" "$CLAUDE_DIR/agents/core/$(basename "$agent")" || true
-        fi
-    fi
-done
-
-# 4. Install rules
-echo -e "\n${BLUE}[4/8] Rules${NC}"
-mkdir -p "$CLAUDE_DIR/rules"
-for rule in "$SCRIPT_DIR/.claude/rules"/*.md; do
-    if [ -f "$rule" ]; then
-        if [ "$UPGRADE_MODE" = true ]; then
-            copy_with_backup "$rule" "$CLAUDE_DIR/rules/$(basename "$rule")"
-        else
-            copy_if_not_exists "$rule" "$CLAUDE_DIR/rules/$(basename "$rule")" || true
-        fi
-    fi
-done
-
-# 5. Install docs
-echo -e "\n${BLUE}[5/8] Docs${NC}"
-mkdir -p "$CLAUDE_DIR/docs"
-for doc in "$SCRIPT_DIR/.claude/docs"/*.md; do
-    if [ -f "$doc" ]; then
-        if [ "$UPGRADE_MODE" = true ]; then
-            copy_with_backup "$doc" "$CLAUDE_DIR/docs/$(basename "$doc")"
-        else
-            copy_if_not_exists "$doc" "$CLAUDE_DIR/docs/$(basename "$doc")" || true
-        fi
-    fi
-done
-
-# 6. Install validators
-echo -e "\n${BLUE}[6/8] Validators${NC}"
-mkdir -p "$CLAUDE_DIR/validators"
-for val in "$SCRIPT_DIR/.claude/validators"/*.py; do
-    [ -f "$val" ] && copy_with_backup "$val" "$CLAUDE_DIR/validators/$(basename "$val")"
-done
-
-# 7. Install hooks
-echo -e "\n${BLUE}[7/8] Hooks${NC}"
-mkdir -p "$CLAUDE_DIR/hooks"
-for hook in "$SCRIPT_DIR/.claude/hooks"/*.py; do
-    [ -f "$hook" ] && copy_with_backup "$hook" "$CLAUDE_DIR/hooks/$(basename "$hook")"
-done
-
-# Configure hooks in settings.json
-MERGE_RESULT=$(python3 "$SCRIPT_DIR/merge-settings.py" 2>&1)
-
-if [[ "$MERGE_RESULT" == "SKIP:"* ]]; then
-    echo -e "  ${YELLOW}⊘${NC} Hook already configured"
-elif [[ "$MERGE_RESULT" == "OK:"* ]]; then
-    echo -e "  ${GREEN}✓${NC} Hook added to settings.json"
-else
-    echo -e "  ${RED}✗${NC} Error: $MERGE_RESULT"
-fi
-
-# 8. LEANN MCP installation
-echo -e "\n${BLUE}[8/8] LEANN MCP${NC}"
+# 10. LEANN MCP installation
+echo -e "\n${BLUE}[10/10] LEANN MCP${NC}"
 if [ "$SKIP_LEANN" = true ]; then
     echo -e "  ${YELLOW}⊘${NC} Skipped (--no-leann)"
 else
@@ -195,7 +79,7 @@ else
             echo -e "  ${YELLOW}⊘${NC} Skipping LEANN (use --no-leann to suppress this warning)"
         else
             echo -e "  ${BLUE}Installing LEANN...${NC}"
-            if uv tool install leann-core --with leann --with "astchunk-extended[all]" --python 3.13 2>/dev/null; then
+            if uv tool install "leann-core>=0.3.8" --with leann --with "astchunk-extended[all]" --python 3.13 2>/dev/null; then
                 echo -e "  ${GREEN}✓${NC} LEANN installed"
 
                 # Patch leann CODE_EXTENSIONS for additional AST languages
@@ -234,8 +118,3 @@ echo -e "  ${BLUE}/orchestrate-plan${NC} <slug>     - planning phase"
 echo -e "  ${BLUE}/orchestrate-execute${NC} <slug>  - execution phase"
 echo
 echo -e "Restart Claude Code to apply changes."
-
-if [ -d "$BACKUP_DIR" ]; then
-    echo
-    echo -e "${YELLOW}Backups saved in: $BACKUP_DIR${NC}"
-fi
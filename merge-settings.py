@@ -1,8 +1,17 @@
 #!/usr/bin/env python3
-"""Merge orchestrator hooks into existing settings.json"""
+"""Merge orchestrator hooks into existing settings.json (or remove them again).
 
+Usage:
+    merge-settings.py [--daemon|--no-daemon]           # ~/.claude/settings.json
+    merge-settings.py --remove
+    merge-settings.py -j 8 /home/*/.claude/settings.json   # batch, in parallel
+    merge-settings.py --paths-from homes.txt [--dry-run]
+"""
+
+import argparse
 import json
 import os
+import re
 import shutil
 import sys
 import tempfile
@@ -10,46 +19,74 @@ from pathlib import Path
 
 SETTINGS_FILE = Path.home() / ".claude" / "settings.json"
 
-ORCHESTRATOR_HOOK = {
-    "matcher": "Write",
-    "hooks": [{
-        "type": "command",
-        "command": "python3 ~/.claude/validators/validate-orchestrate-files.py",
-        "timeout": 5000
-    }]
-}
+# Declarative hook manifest: one entry per workflow hook. apply_manifest() adds
+# missing entries, remove_manifest() takes them out again (used by uninstall.sh).
+# Hooks are identified by the script they run, so edited timeouts/matchers and
+# the hook-client.py variant all count as "already installed".
+HOOK_MANIFEST = [
+    {"event": "PreToolUse", "matcher": "Write", "script": "validators/validate-orchestrate-files.py",
+     "timeout": 5000, "daemon": True, "label": "PreToolUse (orchestrator validator)"},
+    {"event": "SessionStart", "script": "hooks/session-start.py",
+     "label": "SessionStart (restore context)"},
+    {"event": "SessionEnd", "script": "hooks/session-end.py",
+     "label": "SessionEnd (persist state)"},
+    {"event": "PostToolUse", "matcher": "Write", "script": "hooks/stats-collector.py",
+     "timeout": 10000, "daemon": True, "label": "PostToolUse (stats collector)"},
+]
 
-STATS_COLLECTOR_HOOK = {
-    "matcher": "Write",
-    "hooks": [{
-        "type": "command",
-        "command": "python3 ~/.claude/hooks/stats-collector.py",
-        "timeout": 10000
-    }]
-}
+# Daemon variant: Write hooks go through hook-client.py (see hooks/hook-daemon.py)
+HOOK_CLIENT = "python3 ~/.claude/hooks/hook-client.py"
+
+# (marker in command, script path relative to ~/.claude) for hooks with a daemon variant
+DAEMON_CAPABLE = [
+    (os.path.basename(spec["script"]), spec["script"]) for spec in HOOK_MANIFEST if spec.get("daemon")
+]
 
+def hook_command(script, daemon):
+    """Command line for a Write hook script in plain or daemon-client form"""
+    if daemon:
+        return f"{HOOK_CLIENT} {script}"
+    return f"python3 ~/.claude/{script}"
+
+def hook_entry(spec, daemon=False):
+    """settings.json hook entry for a manifest spec"""
+    command = {"type": "command", "command": hook_command(spec["script"], daemon and spec.get("daemon"))}
+    if "timeout" in spec:
+        command["timeout"] = spec["timeout"]
+    entry = {"matcher": spec["matcher"]} if "matcher" in spec else {}
+    entry["hooks"] = [command]
+    return entry
+
+def _spec(script):
+    return next(spec for spec in HOOK_MANIFEST if spec["script"] == script)
+
+ORCHESTRATOR_HOOK = hook_entry(_spec("validators/validate-orchestrate-files.py"))
+STATS_COLLECTOR_HOOK = hook_entry(_spec("hooks/stats-collector.py"))
 SESSION_HOOKS = {
-    "SessionStart": [{
-        "hooks": [{
-            "type": "command",
-            "command": "python3 ~/.claude/hooks/session-start.py"
-        }]
-    }],
-    "SessionEnd": [{
-        "hooks": [{
-            "type": "command",
-            "command": "python3 ~/.claude/hooks/session-end.py"
-        }]
-    }]
+    event: [hook_entry(spec) for spec in HOOK_MANIFEST if spec["event"] == event]
+    for event in ("SessionStart", "SessionEnd")
 }
 
 def atomic_write_json(path, data):
-    """Write JSON atomically: write to temp file, then rename"""
+    """Write JSON atomically: write to temp file, then rename.
+
+    An existing file keeps its mode and owner; a new one gets the owner of
+    its directory and the usual umask-based mode. Merging another user's
+    settings.json as root therefore does not hand it over to root.
+    """
     dir_path = path.parent
+    try:
+        st = os.stat(path)
+        mode, owner = st.st_mode & 0o7777, (st.st_uid, st.st_gid)
+    except FileNotFoundError:
+        parent = os.stat(dir_path)
+        mode, owner = 0o666 & ~current_umask(), (parent.st_uid, parent.st_gid)
     fd, tmp_path = tempfile.mkstemp(dir=dir_path, suffix=".tmp", prefix=".settings-")
     try:
         with os.fdopen(fd, 'w') as f:
             json.dump(data, f, indent=2)
+            os.fchmod(f.fileno(), mode)
+            chown_like(f.fileno(), owner)
         os.replace(tmp_path, path)
     except Exception:
         # Clean up temp file on failure
@@ -59,102 +96,227 @@ def atomic_write_json(path, data):
             pass
         raise
 
+def current_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+def chown_like(fd_or_path, owner):
+    """chown to (uid, gid) when it differs from ours; unprivileged runs keep their own"""
+    if owner == (os.geteuid(), os.getegid()):
+        return
+    try:
+        os.chown(fd_or_path, *owner)
+    except PermissionError:
+        pass
+
 def backup_settings(path):
-    """Create a backup of settings.json before modification"""
+    """Create a backup of settings.json before modification (same owner as the original)"""
     if not path.exists():
         return
     backup = path.with_suffix('.json.bak')
     shutil.copy2(path, backup)
+    st = os.stat(path)
+    chown_like(backup, (st.st_uid, st.st_gid))
+
+def with_variant(hook, daemon):
+    """Copy of a hook entry with daemon-capable commands rewritten to the requested variant"""
+    hook = json.loads(json.dumps(hook))
+    for h in hook.get("hooks", []):
+        for marker, script in DAEMON_CAPABLE:
+            if marker in h.get("command", ""):
+                h["command"] = hook_command(script, daemon)
+    return hook
+
+def identity_patterns(manifest=HOOK_MANIFEST):
+    """[(identity, regex)] for the script each manifest hook runs.
 
-def main():
-    # Load existing settings or create empty
-    if SETTINGS_FILE.exists():
-        with open(SETTINGS_FILE) as f:
-            settings = json.load(f)
-    else:
-        settings = {}
-
-    # Ensure hooks structure exists
-    if "hooks" not in settings:
-        settings["hooks"] = {}
-    if "PreToolUse" not in settings["hooks"]:
-        settings["hooks"]["PreToolUse"] = []
-
-    # Track changes
+    `python3 ~/.claude/validators/validate-orchestrate-files.py` and
+    `python3 ~/.claude/hooks/hook-client.py validators/validate-orchestrate-files.py`
+    both have identity validate-orchestrate-files.py.
+    """
+    names = dict.fromkeys(os.path.basename(spec["script"]) for spec in manifest)
+    return [(name, re.compile(rf"(?:^|[\s/'\"]){re.escape(name)}(?=$|[\s'\"])")) for name in names]
+
+def build_index(settings, manifest=HOOK_MANIFEST):
+    """{identity: [(event, entry index, command index)]} for manifest hooks, in one pass over all events"""
+    patterns = identity_patterns(manifest)
+    index = {}
+    for event, entries in settings.get("hooks", {}).items():
+        if not isinstance(entries, list):
+            continue
+        for i, entry in enumerate(entries):
+            if not isinstance(entry, dict) or not isinstance(entry.get("hooks"), list):
+                continue
+            for j, h in enumerate(entry["hooks"]):
+                command = h.get("command") if isinstance(h, dict) else None
+                if not isinstance(command, str):
+                    continue
+                # Substring test first; the boundary regex only runs on hits
+                for name, pattern in patterns:
+                    if name in command and pattern.search(command):
+                        index.setdefault(name, []).append((event, i, j))
+                        break
+    return index
+
+def check_settings(settings):
+    """Raise ValueError unless settings has the shape the merge engine edits"""
+    if not isinstance(settings, dict):
+        raise ValueError(f"settings must be a JSON object, not {type(settings).__name__}")
+    hooks = settings.get("hooks", {})
+    if not isinstance(hooks, dict):
+        raise ValueError(f'"hooks" must be an object, not {type(hooks).__name__}')
+    for event, entries in hooks.items():
+        if not isinstance(entries, list):
+            raise ValueError(f'"hooks.{event}" must be a list, not {type(entries).__name__}')
+
+def apply_manifest(settings, manifest=HOOK_MANIFEST, daemon=None):
+    """Add missing manifest hooks to settings in place.
+
+    daemon=True/False switches daemon-capable hooks to the daemon-client/plain
+    variant, None leaves existing entries alone. Returns a list of change
+    descriptions. Raises ValueError on malformed settings.
+    """
+    check_settings(settings)
+    hooks = settings.setdefault("hooks", {})
+    index = build_index(settings, manifest)
     changes = []
+    for spec in manifest:
+        identity = os.path.basename(spec["script"])
+        found = [loc for loc in index.get(identity, []) if loc[0] == spec["event"]]
+        if not found:
+            hooks.setdefault(spec["event"], []).append(hook_entry(spec, bool(daemon)))
+            changes.append(spec["label"])
+            continue
+        if daemon is None or not spec.get("daemon"):
+            continue
+        wanted = hook_command(spec["script"], daemon)
+        switched = False
+        for event, i, j in found:
+            h = hooks[event][i]["hooks"][j]
+            if h["command"] != wanted:
+                h["command"] = wanted
+                switched = True
+        if switched:
+            changes.append(f"{identity} ({'daemon client' if daemon else 'plain'})")
+    return changes
+
+def remove_manifest(settings, manifest=HOOK_MANIFEST):
+    """Remove manifest hooks (any variant, any event) from settings in place.
+
+    Other commands sharing an entry are kept; entries, events and the hooks
+    key are dropped once empty. Returns a list of removed descriptions.
+    Raises ValueError on malformed settings.
+    """
+    check_settings(settings)
+    hooks = settings.get("hooks", {})
+    index = build_index(settings, manifest)
+    drop = {}
+    removed = []
+    for spec in manifest:
+        identity = os.path.basename(spec["script"])
+        for event, i, j in index.get(identity, []):
+            drop.setdefault((event, i), set()).add(j)
+        if identity in index:
+            removed.append(spec["label"])
+    for event in {event for event, _ in drop}:
+        kept = []
+        for i, entry in enumerate(hooks[event]):
+            gone = drop.get((event, i))
+            if gone:
+                entry["hooks"] = [h for j, h in enumerate(entry["hooks"]) if j not in gone]
+                if not entry["hooks"]:
+                    continue
+            kept.append(entry)
+        if kept:
+            hooks[event] = kept
+        else:
+            del hooks[event]
+    if "hooks" in settings and not hooks:
+        del settings["hooks"]
+    return removed
+
+def apply_hooks(settings, daemon=None):
+    """Add missing workflow hooks to settings in place (see apply_manifest)"""
+    return apply_manifest(settings, HOOK_MANIFEST, daemon)
+
+def load_settings(path=SETTINGS_FILE):
+    """Existing settings, or empty if the file doesn't exist yet"""
+    if path.exists():
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+def merge_file(path, daemon=None, remove=False, dry_run=False):
+    """Merge (or remove) the manifest hooks in one settings.json.
+
+    Returns (path, changes, error); the file is backed up and rewritten
+    atomically only when something changed.
+    """
+    try:
+        settings = load_settings(path)
+        if remove:
+            changes = remove_manifest(settings)
+        else:
+            changes = apply_manifest(settings, HOOK_MANIFEST, daemon)
+        if changes and not dry_run:
+            backup_settings(path)
+            atomic_write_json(path, settings)
+        return path, changes, None
+    except (OSError, ValueError) as e:
+        return path, [], str(e)
+    except Exception as e:
+        # Never let one file take down a batch run after others were written
+        return path, [], f"{type(e).__name__}: {e}"
+
+def merge_files(paths, daemon=None, remove=False, dry_run=False, jobs=None):
+    """merge_file() over many settings files in parallel worker processes"""
+    if len(paths) == 1:
+        return [merge_file(paths[0], daemon, remove, dry_run)]
+    from concurrent.futures import ProcessPoolExecutor
+    n = len(paths)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(merge_file, paths, [daemon] * n, [remove] * n, [dry_run] * n,
+                             chunksize=max(1, n // (4 * (jobs or os.cpu_count() or 1)))))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="*", type=Path,
+                        help=f"settings.json files to update (default: {SETTINGS_FILE})")
+    parser.add_argument("--paths-from", type=argparse.FileType("r"), metavar="FILE",
+                        help="read settings.json paths from FILE, one per line ('-' for stdin)")
+    parser.add_argument("--remove", action="store_true", help="remove the workflow hooks instead")
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing")
+    parser.add_argument("--jobs", "-j", type=int, help="parallel workers in batch mode (default: CPU count)")
+    variant = parser.add_mutually_exclusive_group()
+    variant.add_argument("--daemon", dest="daemon", action="store_true", default=None,
+                         help="route Write hooks through hook-client.py (persistent daemon)")
+    variant.add_argument("--no-daemon", dest="daemon", action="store_false",
+                         help="run Write hooks as plain python3 commands")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = list(args.paths)
+    if args.paths_from:
+        paths += [Path(line.strip()) for line in args.paths_from if line.strip()]
+    batch = bool(paths)
+    paths = paths or [SETTINGS_FILE]
 
-    # Check if PreToolUse hook already exists
-    pre_tool_use = settings["hooks"]["PreToolUse"]
-    hook_exists = False
-    for hook in pre_tool_use:
-        if isinstance(hook, dict) and hook.get("matcher") == "Write":
-            for h in hook.get("hooks", []):
-                if "validate-orchestrate-files.py" in h.get("command", ""):
-                    hook_exists = True
-                    break
-
-    if not hook_exists:
-        pre_tool_use.append(ORCHESTRATOR_HOOK)
-        changes.append("PreToolUse (orchestrator validator)")
-
-    # Add SessionStart hook if not exists
-    if "SessionStart" not in settings["hooks"]:
-        settings["hooks"]["SessionStart"] = []
-
-    session_start_exists = False
-    for hook in settings["hooks"]["SessionStart"]:
-        for h in hook.get("hooks", []):
-            if "session-start.py" in h.get("command", ""):
-                session_start_exists = True
-                break
-
-    if not session_start_exists:
-        settings["hooks"]["SessionStart"].extend(SESSION_HOOKS["SessionStart"])
-        changes.append("SessionStart (restore context)")
-
-    # Add SessionEnd hook if not exists
-    if "SessionEnd" not in settings["hooks"]:
-        settings["hooks"]["SessionEnd"] = []
-
-    session_end_exists = False
-    for hook in settings["hooks"]["SessionEnd"]:
-        for h in hook.get("hooks", []):
-            if "session-end.py" in h.get("command", ""):
-                session_end_exists = True
-                break
-
-    if not session_end_exists:
-        settings["hooks"]["SessionEnd"].extend(SESSION_HOOKS["SessionEnd"])
-        changes.append("SessionEnd (persist state)")
-
-    # Add PostToolUse hook for stats collection
-    if "PostToolUse" not in settings["hooks"]:
-        settings["hooks"]["PostToolUse"] = []
-
-    stats_exists = False
-    for hook in settings["hooks"]["PostToolUse"]:
-        for h in hook.get("hooks", []):
-            if "stats-collector.py" in h.get("command", ""):
-                stats_exists = True
-                break
-
-    if not stats_exists:
-        settings["hooks"]["PostToolUse"].append(STATS_COLLECTOR_HOOK)
-        changes.append("PostToolUse (stats collector)")
-
-    # Report results
-    if not changes:
-        print("SKIP: All hooks already exist")
-        return 0
-
-    # Backup existing file before modification
-    backup_settings(SETTINGS_FILE)
-
-    # Atomic write
-    atomic_write_json(SETTINGS_FILE, settings)
-
-    print(f"OK: Added hooks: {', '.join(changes)}")
-    return 0
+    failed = 0
+    for path, changes, error in merge_files(paths, args.daemon, args.remove, args.dry_run, args.jobs):
+        where = f"{path}: " if batch else ""
+        if error:
+            failed += 1
+            print(f"ERROR: {where}{error}", file=sys.stderr)
+        elif not changes:
+            print(f"SKIP: {where}" + ("No workflow hooks configured" if args.remove
+                                      else "All hooks already exist"))
+        else:
+            verb = "Removed hooks" if args.remove else "Configured hooks"
+            prefix = "DRY RUN: " if args.dry_run else "OK: "
+            print(f"{prefix}{where}{verb}: {', '.join(changes)}")
+    return 1 if failed else 0
 
 if __name__ == "__main__":
     sys.exit(main())
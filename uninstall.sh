@@ -4,7 +4,9 @@
 
 set -e
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 CLAUDE_DIR="$HOME/.claude"
+MANIFEST_FILE="$CLAUDE_DIR/.workflow-manifest.json"
 
 RED='\033[0;31m'
 GREEN='\033[0;32m'
@@ -37,131 +39,106 @@ remove_if_exists() {
     fi
 }
 
-# 1. Orchestrator Rules
-echo -e "${BLUE}[1/8] Orchestrator Rules${NC}"
-remove_if_exists "$CLAUDE_DIR/orchestrator-rules.md"
-
-# 2. Commands
-COMMANDS=(
-    "orchestrate.md"
-    "orchestrate-research.md"
-    "orchestrate-architecture.md"
-    "orchestrate-plan.md"
-    "orchestrate-execute.md"
-    "orchestrate-auto.md"
-    "verify.md"
-    "build-fix.md"
-)
-
-echo -e "\n${BLUE}[2/8] Commands${NC}"
-for cmd in "${COMMANDS[@]}"; do
-    remove_if_exists "$CLAUDE_DIR/commands/$cmd"
-done
-
-# 3. Agents
-AGENTS=(
-    "codebase-locator.md"
-    "codebase-analyzer.md"
-    "codebase-pattern-finder.md"
-    "web-search-researcher.md"
-    "web-official-docs.md"
-    "web-community.md"
-    "web-issues.md"
-    "web-academic.md"
-    "web-similar-systems.md"
-    "devil-advocate.md"
-    "second-opinion.md"
-    "security-reviewer.md"
-    "strategy-generator.md"
-    "plan-simulator.md"
-    "performance-critic.md"
-    "security-critic.md"
-)
-
-echo -e "\n${BLUE}[3/8] Agents${NC}"
-for agent in "${AGENTS[@]}"; do
-    remove_if_exists "$CLAUDE_DIR/agents/$agent"
-done
-
-# 4. Rules
-RULES=(
-    "security.md"
-    "coding-style.md"
-    "performance.md"
-)
-
-echo -e "\n${BLUE}[4/8] Rules${NC}"
-for rule in "${RULES[@]}"; do
-    remove_if_exists "$CLAUDE_DIR/rules/$rule"
-done
-
-# 5. Docs
-DOCS=(
-    "orchestrate-file-formats.md"
-)
-
-echo -e "\n${BLUE}[5/8] Docs${NC}"
-for doc in "${DOCS[@]}"; do
-    remove_if_exists "$CLAUDE_DIR/docs/$doc"
-done
-
-# 6. Validators
-echo -e "\n${BLUE}[6/8] Validators${NC}"
-remove_if_exists "$CLAUDE_DIR/validators/validate-orchestrate-files.py"
-
-# 7. Hooks (Python files)
-echo -e "\n${BLUE}[7/8] Hook scripts${NC}"
-remove_if_exists "$CLAUDE_DIR/hooks/session-start.py"
-remove_if_exists "$CLAUDE_DIR/hooks/session-end.py"
+if [ -f "$CLAUDE_DIR/hooks/hook-daemon.py" ]; then
+    python3 "$CLAUDE_DIR/hooks/hook-daemon.py" stop >/dev/null 2>&1 || true
+fi
+
+# 1-7. Installed files: driven by the install manifest when present
+if [ -f "$MANIFEST_FILE" ] && [ -f "$SCRIPT_DIR/install-engine.py" ]; then
+    echo -e "${BLUE}[1-7/9] Installed files (from manifest)${NC}"
+    python3 "$SCRIPT_DIR/install-engine.py" uninstall
+else
+    # 1. Orchestrator Rules
+    echo -e "${BLUE}[1/9] Orchestrator Rules${NC}"
+    remove_if_exists "$CLAUDE_DIR/orchestrator-rules.md"
+
+    # 2. Commands
+    COMMANDS=(
+        "orchestrate.md"
+        "orchestrate-research.md"
+        "orchestrate-architecture.md"
+        "orchestrate-plan.md"
+        "orchestrate-execute.md"
+        "orchestrate-auto.md"
+        "verify.md"
+        "build-fix.md"
+    )
+
+    echo -e "\n${BLUE}[2/9] Commands${NC}"
+    for cmd in "${COMMANDS[@]}"; do
+        remove_if_exists "$CLAUDE_DIR/commands/$cmd"
+    done
+
+    # 3. Agents
+    AGENTS=(
+        "codebase-locator.md"
+        "codebase-analyzer.md"
+        "codebase-pattern-finder.md"
+        "web-search-researcher.md"
+        "web-official-docs.md"
+        "web-community.md"
+        "web-issues.md"
+        "web-academic.md"
+        "web-similar-systems.md"
+        "devil-advocate.md"
+        "second-opinion.md"
+        "security-reviewer.md"
+        "strategy-generator.md"
+        "plan-simulator.md"
+        "performance-critic.md"
+        "security-critic.md"
+    )
+
+    echo -e "\n${BLUE}[3/9] Agents${NC}"
+    for agent in "${AGENTS[@]}"; do
+        remove_if_exists "$CLAUDE_DIR/agents/$agent"
+    done
+
+    # 4. Rules
+    RULES=(
+        "security.md"
+        "coding-style.md"
+        "performance.md"
+    )
+
+    echo -e "\n${BLUE}[4/9] Rules${NC}"
+    for rule in "${RULES[@]}"; do
+        remove_if_exists "$CLAUDE_DIR/rules/$rule"
+    done
+
+    # 5. Docs
+    DOCS=(
+        "orchestrate-file-formats.md"
+    )
+
+    echo -e "\n${BLUE}[5/9] Docs${NC}"
+    for doc in "${DOCS[@]}"; do
+        remove_if_exists "$CLAUDE_DIR/docs/$doc"
+    done
+
+    # 6. Validators
+    echo -e "\n${BLUE}[6/9] Validators${NC}"
+    remove_if_exists "$CLAUDE_DIR/validators/validate-orchestrate-files.py"
+    remove_if_exists "$CLAUDE_DIR/validators/secrets_scan.py"
+
+    # 7. Hooks (Python files)
+    echo -e "\n${BLUE}[7/9] Hook scripts${NC}"
+    remove_if_exists "$CLAUDE_DIR/hooks/session-start.py"
+    remove_if_exists "$CLAUDE_DIR/hooks/session-end.py"
+    remove_if_exists "$CLAUDE_DIR/hooks/stats-collector.py"
+    remove_if_exists "$CLAUDE_DIR/hooks/hook-daemon.py"
+    remove_if_exists "$CLAUDE_DIR/hooks/hook-client.py"
+    remove_if_exists "$CLAUDE_DIR/hooks/hook_runtime.py"
+    remove_if_exists "$CLAUDE_DIR/hooks/verdict_cache.py"
+    remove_if_exists "$CLAUDE_DIR/hooks/stats_store.py"
+    remove_if_exists "$CLAUDE_DIR/hooks/session_store.py"
+fi
 
 # 8. Remove hooks from settings.json
-echo -e "\n${BLUE}[8/8] Settings.json hooks${NC}"
+echo -e "\n${BLUE}[8/9] Settings.json hooks${NC}"
 if [ -f "$CLAUDE_DIR/settings.json" ]; then
-    python3 -c "
-import json, sys
-settings_path = '$CLAUDE_DIR/settings.json'
-with open(settings_path) as f:
-    settings = json.load(f)
-
-hooks = settings.get('hooks', {})
-changed = False
-
-# Remove PreToolUse validator hook
-pre = hooks.get('PreToolUse', [])
-new_pre = [h for h in pre if not (isinstance(h, dict) and 'validate-orchestrate-files.py' in str(h.get('hooks', [{}])[0].get('command', '')) if h.get('hooks') else False)]
-if len(new_pre) != len(pre):
-    hooks['PreToolUse'] = new_pre
-    changed = True
-
-# Remove SessionStart hook
-ss = hooks.get('SessionStart', [])
-new_ss = [h for h in ss if not any('session-start.py' in sub.get('command', '') for sub in h.get('hooks', []))]
-if len(new_ss) != len(ss):
-    hooks['SessionStart'] = new_ss
-    changed = True
-
-# Remove SessionEnd hook
-se = hooks.get('SessionEnd', [])
-new_se = [h for h in se if not any('session-end.py' in sub.get('command', '') for sub in h.get('hooks', []))]
-if len(new_se) != len(se):
-    hooks['SessionEnd'] = new_se
-    changed = True
-
-# Clean up empty hook arrays
-for key in list(hooks.keys()):
-    if not hooks[key]:
-        del hooks[key]
-
-if not hooks:
-    del settings['hooks']
-
-if changed:
-    with open(settings_path, 'w') as f:
-        json.dump(settings, f, indent=2)
-    print('  Hooks removed from settings.json')
-else:
-    print('  No hooks to remove')
-" 2>/dev/null && echo -e "  ${GREEN}✓${NC} Cleaned" || echo -e "  ${YELLOW}⊘${NC} Manual cleanup may be needed"
+    # Same hook manifest merge-settings.py installs from, applied in reverse
+    python3 "$SCRIPT_DIR/merge-settings.py" --remove 2>/dev/null && echo -e "  ${GREEN}✓${NC} Cleaned" || echo -e "  ${YELLOW}⊘${NC} Manual cleanup may be needed"
 fi
 
 # 9. Remove LEANN MCP